@@ -0,0 +1,163 @@
+from collections import OrderedDict
+from collections.abc import Callable
+from threading import Lock
+from time import monotonic
+
+
+class LRUCache[K, V]:
+    """Thread-safe mapping that holds at most `maxsize` items. When a new
+    item is added to a full cache, the least recently used item is discarded.
+    If `ttl` is set, items also expire that many seconds after they are added.
+
+    ```pycon
+    >>> cache = LRUCache(maxsize=2)
+    >>> cache['a'] = 1
+    >>> cache['b'] = 2
+    >>> cache['a']
+    1
+    >>> cache['c'] = 3
+    >>> 'b' in cache
+    False
+    >>> sorted(cache.keys())
+    ['a', 'c']
+
+    ```
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float | None = None, timer: Callable[[], float] = monotonic):
+        self.maxsize = maxsize
+        """Maximum number of items to keep in the cache."""
+        self.ttl = ttl
+        """Number of seconds that an item stays in the cache after it is added.
+        Defaults to `None`, meaning that items only leave the cache when they
+        are evicted or deleted."""
+        self._timer = timer
+        # values are stored with their expiration time
+        self._items: OrderedDict[K, tuple[V, float]] = OrderedDict()
+        self._lock = Lock()
+
+    def _is_expired(self, expires: float) -> bool:
+        return self.ttl is not None and expires <= self._timer()
+
+    def __getitem__(self, key: K) -> V:
+        with self._lock:
+            value, expires = self._items[key]
+            if self._is_expired(expires):
+                del self._items[key]
+                raise KeyError(key)
+            self._items.move_to_end(key)
+            return value
+
+    def __setitem__(self, key: K, value: V):
+        expires = self._timer() + self.ttl if self.ttl is not None else float('inf')
+        with self._lock:
+            self._items[key] = value, expires
+            self._items.move_to_end(key)
+            if len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def __delitem__(self, key: K):
+        with self._lock:
+            del self._items[key]
+
+    def __contains__(self, key: K) -> bool:
+        with self._lock:
+            return key in self._items and not self._is_expired(self._items[key][1])
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        """Return the value for `key` if it is in the cache, otherwise
+        return `default`."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def pop(self, key: K, default: V | None = None) -> V | None:
+        """Remove `key` from the cache and return its value if it is in the
+        cache, otherwise return `default`."""
+        with self._lock:
+            if key not in self._items:
+                return default
+            value, expires = self._items.pop(key)
+            return default if self._is_expired(expires) else value
+
+    def keys(self) -> list[K]:
+        """Return a list of the keys currently in the cache, from least
+        to most recently used."""
+        with self._lock:
+            return [key for key, (_, expires) in self._items.items() if not self._is_expired(expires)]
+
+    def clear(self):
+        """Remove all items from the cache."""
+        with self._lock:
+            self._items.clear()
+
+
+class slot_cached_property:
+    """Decorator that works like `functools.cached_property`, but for
+    classes that use `__slots__` and therefore have no instance `__dict__`
+    to cache values in. The computed value is stored in the attribute named
+    by `slot`, which must be listed in the class's `__slots__`.
+
+    If `lock` is given, it is the name of an attribute that holds a lock
+    (usually a `threading.RLock`, since computing one property may need
+    another). The value is then computed while holding that lock, so that
+    threads sharing an instance compute it only once. Without a `lock`,
+    concurrent first accesses may each compute the value, and the last one
+    to finish is kept.
+
+    ```pycon
+    >>> class Square:
+    ...     __slots__ = ('side', '_area')
+    ...     def __init__(self, side):
+    ...         self.side = side
+    ...     @slot_cached_property('_area')
+    ...     def area(self):
+    ...         print('computing')
+    ...         return self.side ** 2
+    >>> square = Square(3)
+    >>> square.area
+    computing
+    9
+    >>> square.area
+    9
+
+    ```
+    """
+
+    def __init__(self, slot: str, lock: str = None):
+        self.slot = slot
+        """Name of the attribute that holds the computed value."""
+        self.lock = lock
+        """Name of the attribute that holds the lock to compute the value
+        with, or `None` to compute it without locking."""
+        self.func = None
+
+    def __call__(self, func):
+        self.func = func
+        self.__doc__ = func.__doc__
+        return self
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            return getattr(instance, self.slot)
+        except AttributeError:
+            pass
+        if self.lock is None:
+            value = self.func(instance)
+        else:
+            with getattr(instance, self.lock):
+                # another thread may have computed the value while this one
+                # was waiting for the lock
+                try:
+                    return getattr(instance, self.slot)
+                except AttributeError:
+                    value = self.func(instance)
+        # use object.__setattr__ so that this also works on frozen dataclasses
+        object.__setattr__(instance, self.slot, value)
+        return value
@@ -1,6 +1,6 @@
-import json
 from typing import Any
 
+import orjson
 from werkzeug import Response
 from werkzeug.exceptions import HTTPException, BadRequest, NotFound, InternalServerError
 
@@ -15,6 +15,25 @@ class ProblemDetailError(HTTPException):
     """Used as the problem detail `details`. The value is treated as a format
     string, and is filled in using the `params` dictionary."""
 
+    _problem_detail_prefix: bytes | None = None
+    """Serialized `status` and `title` members of the problem detail,
+    up to the start of the `details` value."""
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # the status and title are constant for each subclass, so serialize
+        # them once; subclasses that customize as_problem_detail() or do not
+        # define both values fall back to serializing the whole dictionary
+        code, name = getattr(cls, 'code', None), getattr(cls, 'name', None)
+        if (
+            cls.as_problem_detail is ProblemDetailError.as_problem_detail
+            and isinstance(code, int)
+            and isinstance(name, str)
+        ):
+            cls._problem_detail_prefix = orjson.dumps({'status': code, 'title': name})[:-1] + b',"details":'
+        else:
+            cls._problem_detail_prefix = None
+
     def __init__(self, description=None, response=None, **params):
         super().__init__(description, response)
         self.params = params
@@ -37,6 +56,12 @@ class ProblemDetailError(HTTPException):
             'details': self.description.format(**self.params),
         }
 
+    def as_problem_detail_json(self) -> bytes:
+        """Serialize the dictionary from `as_problem_detail()` as JSON."""
+        if self._problem_detail_prefix is None:
+            return orjson.dumps(self.as_problem_detail())
+        return self._problem_detail_prefix + orjson.dumps(self.description.format(**self.params)) + b'}'
+
 
 def problem_detail_response(e: ProblemDetailError) -> Response:
     """Return a JSON Problem Detail ([RFC 9457](https://www.rfc-editor.org/rfc/rfc9457))
@@ -59,7 +84,7 @@ def problem_detail_response(e: ProblemDetailError) -> Response:
     # start with the correct headers and status code from the error
     response = e.get_response()
     # replace the body with JSON
-    response.data = json.dumps(e.as_problem_detail())
+    response.data = e.as_problem_detail_json()
     response.content_type = 'application/problem+json'
     return response
 
@@ -1,13 +1,19 @@
 import logging
-from dataclasses import dataclass
+from collections.abc import Iterator, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from fractions import Fraction
-from functools import cached_property
-from typing import NamedTuple, Any
+from threading import RLock
+from functools import cached_property, lru_cache
+from typing import Any
 from urllib.parse import urlencode
 
+import orjson
 import requests
 
+from papaya.cache import LRUCache, slot_cached_property
 from papaya.errors import IdentifierProblem, ManifestNotFound, ServiceProblem, ManifestNotAvailable
+from papaya.sessions import create_session
 from papaya.source import (
     Resource,
     SolrService,
@@ -23,10 +29,19 @@ logger = logging.getLogger(__name__)
 
 PRESENTATION_API_CONTEXT = 'http://iiif.io/api/presentation/2/context.json'
 DEFAULT_THUMBNAIL_WIDTH = 250
+DEFAULT_INFO_CACHE_SIZE = 10_000
+DEFAULT_PREFETCH_WORKERS = 16
+DEFAULT_IMAGE_TIMEOUT = 10
 
 
-class ImageParams(NamedTuple):
-    """Tuple for holding a set of IIIF Image API parameters. See
+@lru_cache(maxsize=4096)
+def _format_params(region: str, size: str, rotation: str, quality: str, format: str) -> str:
+    return f'/{region}/{size}/{rotation}/{quality}.{format}'
+
+
+@dataclass(frozen=True, slots=True)
+class ImageParams:
+    """Immutable set of IIIF Image API parameters. See
     https://iiif.io/api/image/2.0/#image-request-parameters for information
     about each parameter."""
 
@@ -42,10 +57,11 @@ class ImageParams(NamedTuple):
     """`jpg` | `tif` | `png` | `gif` | `jp2` | `pdf` | `webp`"""
 
     def __str__(self):
-        return f'/{self.region}/{self.size}/{self.rotation}/{self.quality}.{self.format}'
+        return _format_params(self.region, self.size, self.rotation, self.quality, self.format)
 
 
-class ImageInfo(NamedTuple):
+@dataclass(frozen=True, slots=True)
+class ImageInfo:
     """Image information from the IIIF Image API service"""
 
     uri: str
@@ -58,6 +74,13 @@ class ImageInfo(NamedTuple):
     """Image width"""
     height: int
     """Image height"""
+    service: dict[str, Any] = field(init=False, repr=False, compare=False)
+    """Service description to embed in a IIIF Presentation API image
+    resource. This is shared by every image that uses this information,
+    so it must not be modified."""
+
+    def __post_init__(self):
+        object.__setattr__(self, 'service', {'@context': self.context, '@id': self.uri, 'profile': self.profile})
 
     @property
     def aspect_ratio(self) -> Fraction:
@@ -72,15 +95,59 @@ class ImageServiceError(Exception):
 class ImageService:
     """IIIF Image API service endpoint."""
 
-    def __init__(self, endpoint: str, thumbnail_width: int = 250):
+    def __init__(
+        self,
+        endpoint: str,
+        thumbnail_width: int = 250,
+        info_cache_size: int = DEFAULT_INFO_CACHE_SIZE,
+        prefetch_workers: int = DEFAULT_PREFETCH_WORKERS,
+        timeout: float = DEFAULT_IMAGE_TIMEOUT,
+    ):
         self.endpoint = endpoint
         self.thumbnail_width = thumbnail_width
+        self.timeout = timeout
+        """Number of seconds to wait for a response from the IIIF Image API
+        server. Defaults to 10."""
+        self.prefetch_workers = prefetch_workers
+        """Maximum number of concurrent requests that `prefetch_metadata()`
+        sends to the IIIF Image API server."""
+        # image information does not change for a given image ID,
+        # so keep the most recently used results in memory
+        self._info_cache: LRUCache[str, ImageInfo] = LRUCache(maxsize=info_cache_size)
+        # reuse connections to the image server across requests
+        self._session = create_session(pool_size=max(32, prefetch_workers))
+        # shared by all requests, so the total number of concurrent
+        # prefetch requests is limited, and no threads are started per request
+        self._executor = ThreadPoolExecutor(max_workers=prefetch_workers, thread_name_prefix='ImageService')
 
     def get_metadata(self, image_id: str) -> ImageInfo:
+        """Get the image information for `image_id`. Results are cached,
+        so subsequent calls for the same `image_id` do not contact the
+        IIIF Image API server until `invalidate()` is called."""
+        if (info := self._info_cache.get(image_id)) is None:
+            info = self._info_cache[image_id] = self._fetch_metadata(image_id)
+        return info
+
+    def prefetch_metadata(self, image_ids: Iterable[str]):
+        """Retrieve and cache the image information for each of the `image_ids`
+        that is not already cached, sending up to `prefetch_workers` requests
+        concurrently. Raises `ImageServiceError` if any request fails."""
+        missing = {image_id for image_id in image_ids if image_id not in self._info_cache}
+        for _ in self._executor.map(self.get_metadata, missing):
+            pass
+
+    def invalidate(self, image_id: str):
+        """Remove the cached image information for `image_id`, if any."""
+        try:
+            del self._info_cache[image_id]
+        except KeyError:
+            pass
+
+    def _fetch_metadata(self, image_id: str) -> ImageInfo:
         url = f'{self.endpoint}/{image_id}'
         try:
-            response = requests.get(url)
-        except requests.ConnectionError as e:
+            response = self._session.get(url, timeout=self.timeout)
+        except requests.RequestException as e:
             logger.error(f'Unable to retrieve metadata from IIIF Image Service: {e}')
             raise ImageServiceError(f'Problem retrieving image: {e}') from e
         if not response.ok:
@@ -96,66 +163,134 @@ class ImageService:
 
 
 FULL_IMAGE_PARAMS = ImageParams('full', 'full', '0', 'default', 'jpg')
+FULL_IMAGE_SUFFIX = str(FULL_IMAGE_PARAMS)
+
+
+def _open_list(info: dict[str, Any], key: str) -> bytes:
+    """Serialize `info` as a JSON object, but leave it open and start a
+    list under `key`, so the serialized list items can be appended."""
+    return orjson.dumps(info)[:-1] + b',' + orjson.dumps(key) + b':['
 
 
 class Manifest:
     """IIIF Manifest"""
 
-    def __init__(self, ctx: PresentationContext, id: str, text_query: str = None):
+    __slots__ = (
+        'ctx',
+        'id',
+        'text_query',
+        'with_text_matches',
+        '_uri_prefix',
+        '_uri',
+        '_resource',
+        '_sequences',
+        '_sequence_index',
+        '_canvas_index',
+        '_annotation_index',
+        '_lock',
+    )
+
+    def __init__(
+        self,
+        ctx: PresentationContext,
+        id: str,
+        text_query: str = None,
+        with_text_matches: bool = False,
+        resource: Resource = None,
+    ):
         self.ctx: PresentationContext = ctx
         self.id: str = id
         self.text_query: str = text_query
+        # when true, retrieve the text matches for the text query in
+        # the same Solr request as the resource
+        self.with_text_matches: bool = with_text_matches and text_query is not None
+        # common prefix of the URIs of this manifest and its components
+        self._uri_prefix = f'{self.ctx.endpoint_url}/{self.id}'
+        if resource is not None:
+            self._resource = resource
+        # cached manifests are shared by concurrent requests; this lock (also
+        # used by the sequences and canvases) ensures that the structure of
+        # the manifest is only built once
+        self._lock = RLock()
 
     @property
     def base_uri(self) -> str:
         return self.ctx.endpoint_url
 
-    @property
+    @slot_cached_property('_uri')
     def uri(self) -> str:
-        uri = f'{self.base_uri}/{self.id}/manifest'
+        uri = self._uri_prefix + '/manifest'
         if self.text_query is not None:
             uri += '?' + urlencode({'q': self.text_query})
         return uri
 
-    @cached_property
+    @slot_cached_property('_resource')
     def resource(self) -> Resource:
-        return self.ctx.get_resource(self.id)
+        return self.ctx.get_resource(self.id, self.text_query if self.with_text_matches else None)
 
-    @cached_property
-    def sequences(self) -> list[Sequence]:
-        return [Sequence(manifest=self, name='normal')]
+    @slot_cached_property('_sequences', lock='_lock')
+    def sequences(self) -> tuple[Sequence, ...]:
+        return (Sequence(manifest=self, name='normal'),)
+
+    @slot_cached_property('_sequence_index', lock='_lock')
+    def _sequence_by_name(self) -> dict[str, Sequence]:
+        return {sequence.name: sequence for sequence in self.sequences}
+
+    def has_sequence(self, name: str) -> bool:
+        return name in self._sequence_by_name
 
     def find_sequence(self, name: str) -> Sequence:
-        for sequence in self.sequences:
-            if sequence.name == name:
-                return sequence
-        else:
-            raise KeyError(name)
+        return self._sequence_by_name[name]
+
+    @slot_cached_property('_canvas_index', lock='_lock')
+    def _canvas_by_name(self) -> dict[str, Canvas]:
+        return {canvas.name: canvas for sequence in self.sequences for canvas in sequence.canvases}
+
+    @slot_cached_property('_annotation_index', lock='_lock')
+    def _annotation_by_name(self) -> dict[str, ImageAnnotation]:
+        return {canvas.image_annotation.name: canvas.image_annotation for canvas in self._canvas_by_name.values()}
+
+    def has_canvas(self, name: str) -> bool:
+        return name in self._canvas_by_name
 
     def find_canvas(self, name: str) -> Canvas:
-        for sequence in self.sequences:
-            for canvas in sequence.canvases:
-                if canvas.name == name:
-                    return canvas
-        else:
-            raise KeyError(name)
+        return self._canvas_by_name[name]
+
+    def has_annotation(self, name: str) -> bool:
+        return name in self._annotation_by_name
 
     def find_annotation(self, name: str) -> ImageAnnotation:
-        for sequence in self.sequences:
-            for canvas in sequence.canvases:
-                if canvas.image_annotation.name == name:
-                    return canvas.image_annotation
-        else:
-            raise KeyError(name)
+        return self._annotation_by_name[name]
 
-    def json(self, with_context: bool = False) -> dict[str, Any]:
+    def summary_json(self, with_context: bool = False) -> dict[str, Any]:
+        """Abbreviated form of the manifest that omits the `sequences`.
+        Only the image information for the first canvas (used for the
+        thumbnail) is retrieved."""
+        summary_info: dict[str, Any] = {
+            '@id': self.uri,
+            '@type': 'sc:Manifest',
+            'label': self.resource.label,
+        }
+        try:
+            summary_info['thumbnail'] = self.sequences[0].canvases[0].thumbnail.json()
+        except IndexError:
+            pass
+
+        if self.ctx.logo_url is not None:
+            summary_info['logo'] = {'@id': self.ctx.logo_url}
+
+        if with_context:
+            summary_info.update({'@context': PRESENTATION_API_CONTEXT})
+
+        return summary_info
+
+    def _json_without_sequences(self, with_context: bool = False) -> dict[str, Any]:
         manifest_info: dict[str, Any] = {
             '@id': self.uri,
             '@type': 'sc:Manifest',
             'label': self.resource.label,
             'metadata': self.resource.metadata,
             'description': self.resource.description,
-            'sequences': [seq.json() for seq in self.sequences],
             'navDate': self.resource.date,
             'license': self.resource.license,
         }
@@ -172,39 +307,67 @@ class Manifest:
 
         return manifest_info
 
+    def json(self, with_context: bool = False) -> dict[str, Any]:
+        manifest_info = self._json_without_sequences(with_context)
+        manifest_info['sequences'] = [seq.json() for seq in self.sequences]
+        return manifest_info
+
+    def iter_json(self, with_context: bool = False) -> Iterator[bytes]:
+        """Serialize the manifest as JSON in chunks, one per canvas. The
+        concatenated chunks are equivalent to serializing `json()`, but the
+        complete manifest dictionary is never built in memory.
+
+        All image metadata is retrieved before the first chunk is generated."""
+        for sequence in self.sequences:
+            sequence.prefetch_images()
+        yield _open_list(self._json_without_sequences(with_context), 'sequences')
+        for n, sequence in enumerate(self.sequences):
+            if n > 0:
+                yield b','
+            yield from sequence.iter_json()
+        yield b']}'
+
 
 class Sequence:
     """IIIF Sequence"""
 
+    __slots__ = ('manifest', 'name', 'ctx', 'resource', '_uri_prefix', '_uri', '_canvases', '_canvas_index', '_lock')
+
     def __init__(self, manifest: Manifest, name: str):
         self.manifest: Manifest = manifest
         self.name: str = name
         self.ctx: PresentationContext = self.manifest.ctx
         self.resource: Resource = self.manifest.resource
+        self._uri_prefix: str = self.manifest._uri_prefix
+        self._lock: RLock = self.manifest._lock
 
-    @property
+    @slot_cached_property('_uri')
     def uri(self) -> str:
-        return f'{self.manifest.base_uri}/{self.manifest.id}/sequence/{self.name}'
+        return self._uri_prefix + '/sequence/' + self.name
 
-    @cached_property
-    def canvases(self) -> list[Canvas]:
-        return [
+    @slot_cached_property('_canvases', lock='_lock')
+    def canvases(self) -> tuple[Canvas, ...]:
+        return tuple(
             Canvas(sequence=self, name=str(index), page_uri=page_uri)
             for index, page_uri in enumerate(self.resource.page_uris)
-        ]
+        )
+
+    @slot_cached_property('_canvas_index', lock='_lock')
+    def _canvas_by_name(self) -> dict[str, Canvas]:
+        return {canvas.name: canvas for canvas in self.canvases}
 
     def get_canvas(self, name: str) -> Canvas:
-        for canvas in self.canvases:
-            if canvas.name == name:
-                return canvas
-        else:
-            raise KeyError(name)
+        return self._canvas_by_name[name]
 
-    def json(self, with_context: bool = False) -> dict[str, Any]:
+    def prefetch_images(self):
+        """Retrieve the image metadata for all canvases in this sequence
+        concurrently. See `ImageService.prefetch_metadata()`."""
+        self.ctx.image_service.prefetch_metadata(canvas.image_id for canvas in self.canvases)
+
+    def _json_without_canvases(self, with_context: bool = False) -> dict[str, Any]:
         sequence_info = {
             '@id': self.uri,
             '@type': 'sc:Sequence',
-            'canvases': [canvas.json() for canvas in self.canvases],
         }
         if len(self.canvases) > 0:
             sequence_info['startCanvas'] = self.canvases[0].uri
@@ -214,10 +377,39 @@ class Sequence:
 
         return sequence_info
 
+    def json(self, with_context: bool = False) -> dict[str, Any]:
+        self.prefetch_images()
+        sequence_info = self._json_without_canvases(with_context)
+        sequence_info['canvases'] = [canvas.json() for canvas in self.canvases]
+        return sequence_info
+
+    def iter_json(self, with_context: bool = False) -> Iterator[bytes]:
+        """Serialize the sequence as JSON in chunks, one per canvas. See
+        `Manifest.iter_json()`."""
+        self.prefetch_images()
+        yield _open_list(self._json_without_canvases(with_context), 'canvases')
+        for n, canvas in enumerate(self.canvases):
+            yield (b',' if n > 0 else b'') + orjson.dumps(canvas.json())
+        yield b']}'
+
 
 class Canvas:
     """IIIF Canvas"""
 
+    __slots__ = (
+        'sequence',
+        'name',
+        'page_uri',
+        'manifest',
+        'resource',
+        'image_id',
+        '_uri_prefix',
+        '_uri',
+        '_image_annotation',
+        '_thumbnail',
+        '_lock',
+    )
+
     def __init__(self, sequence: Sequence, name: str, page_uri: str):
         self.sequence = sequence
         self.name = name
@@ -225,12 +417,14 @@ class Canvas:
         self.manifest = self.sequence.manifest
         self.resource = self.manifest.resource
         self.image_id = self.resource.get_page_image_id(self.page_uri)
+        self._uri_prefix = self.manifest._uri_prefix
+        self._lock = self.manifest._lock
 
-    @property
+    @slot_cached_property('_uri')
     def uri(self) -> str:
-        return f'{self.manifest.base_uri}/{self.manifest.id}/canvas/{self.name}'
+        return self._uri_prefix + '/canvas/' + self.name
 
-    @cached_property
+    @slot_cached_property('_image_annotation', lock='_lock')
     def image_annotation(self) -> ImageAnnotation:
         return ImageAnnotation(
             canvas=self,
@@ -242,14 +436,17 @@ class Canvas:
             ),
         )
 
-    @cached_property
+    @slot_cached_property('_thumbnail', lock='_lock')
     def thumbnail(self) -> ThumbnailImage:
         return ThumbnailImage(self.manifest.ctx.image_service, self.image_id)
 
     def search_text(self, query: str) -> list[TaggedText]:
-        resource_uri = self.manifest.resource.uri
+        # the canvas name is its page index
         page_index = int(self.name)
-        return self.manifest.ctx.solr_service.get_text_matches(resource_uri, query, page_index)
+        resource = self.manifest.resource
+        if query == self.manifest.text_query and resource.text_matches is not None:
+            return [hit for hit in resource.text_matches if hit.page == page_index]
+        return self.manifest.ctx.solr_service.get_text_matches(resource.uri, query, page_index)
 
     def json(self, with_context: bool = False) -> dict[str, Any]:
         canvas_info = {
@@ -280,6 +477,8 @@ class Canvas:
 class ImageAnnotation:
     """IIIF Image Annotation"""
 
+    __slots__ = ('canvas', 'manifest', 'name', 'motivation', 'image', '_uri')
+
     def __init__(self, canvas: Canvas, name: str, image: Image, motivation: str = 'sc:painting'):
         self.canvas = canvas
         self.manifest = self.canvas.manifest
@@ -287,9 +486,9 @@ class ImageAnnotation:
         self.motivation = motivation
         self.image = image
 
-    @property
+    @slot_cached_property('_uri')
     def uri(self) -> str:
-        return f'{self.manifest.base_uri}/{self.manifest.id}/annotation/{self.name}'
+        return self.manifest._uri_prefix + '/annotation/' + self.name
 
     @property
     def width(self) -> int:
@@ -317,45 +516,55 @@ class ImageAnnotation:
 class Image:
     """IIIF Image"""
 
+    __slots__ = ('service', 'image_id', 'iiif_params', '_params_suffix', '_info', '_base_json_value')
+
     def __init__(self, service: ImageService, image_id: str, iiif_params: ImageParams = None):
         self.service = service
         self.image_id = image_id
         self.iiif_params = iiif_params
+        # the parameters do not change, so format them once
+        if iiif_params is FULL_IMAGE_PARAMS:
+            self._params_suffix = FULL_IMAGE_SUFFIX
+        else:
+            self._params_suffix = str(iiif_params) if iiif_params is not None else ''
 
     @property
     def uri(self) -> str:
-        if self.iiif_params is not None:
-            return self.info.uri + str(self.iiif_params)
-        else:
-            return self.info.uri
+        return self.info.uri + self._params_suffix
 
-    @cached_property
+    @slot_cached_property('_info')
     def info(self) -> ImageInfo:
         return self.service.get_metadata(self.image_id)
 
-    def json(self) -> dict[str, Any]:
+    @slot_cached_property('_base_json_value')
+    def _base_json(self) -> dict[str, Any]:
         return {
             '@id': self.uri,
             '@type': 'dctypes:Image',
-            'service': {
-                '@context': self.info.context,
-                '@id': self.info.uri,
-                'profile': self.info.profile,
-            },
+            'service': self.info.service,
             'format': 'image/jpeg',
             'height': self.info.height,
             'width': self.info.width,
         }
 
+    def json(self) -> dict[str, Any]:
+        # the dictionary only depends on the image info and parameters,
+        # so build it once and hand out shallow copies
+        return dict(self._base_json)
+
 
 class ThumbnailImage(Image):
     """IIIF thumbnail image"""
 
+    __slots__ = ('width', 'height')
+
     def __init__(self, service: ImageService, image_id: str):
         super().__init__(service, image_id)
         self.width = self.service.thumbnail_width
-        self.height = int(self.width / self.info.aspect_ratio)
+        # equivalent to int(self.width / self.info.aspect_ratio), without the Fraction arithmetic
+        self.height = self.width * self.info.height // self.info.width
         self.iiif_params = ImageParams(size=f'{self.width},{self.height}')
+        self._params_suffix = str(self.iiif_params)
 
     def json(self) -> dict[str, Any]:
         image = super().json()
@@ -372,10 +581,10 @@ class SearchHitsList:
         self.manifest = self.canvas.manifest
         self.query = query
 
-    @property
+    @cached_property
     def uri(self) -> str:
         query_string = urlencode({'q': self.query})
-        return f'{self.manifest.base_uri}/{self.manifest.id}/list/{self.canvas.name}-search?{query_string}'
+        return f'{self.manifest._uri_prefix}/list/{self.canvas.name}-search?{query_string}'
 
     @cached_property
     def search_hits(self) -> list[TaggedText]:
@@ -387,11 +596,10 @@ class SearchHitsList:
             SearchResult(self.canvas, f'{self.uri}#result-{i:03d}', hit) for i, hit in enumerate(self.search_hits, 1)
         ]
 
-    def json(self, with_context: bool = False) -> dict[str, Any]:
+    def _json_without_resources(self, with_context: bool = False) -> dict[str, Any]:
         list_info = {
             '@id': self.uri,
             '@type': 'sc:AnnotationList',
-            'resources': [annotation.json() for annotation in self.annotations],
         }
 
         if with_context:
@@ -399,6 +607,27 @@ class SearchHitsList:
 
         return list_info
 
+    def json(self, with_context: bool = False) -> dict[str, Any]:
+        list_info = self._json_without_resources(with_context)
+        list_info['resources'] = [annotation.json() for annotation in self.annotations]
+        return list_info
+
+    def iter_json(self, with_context: bool = False) -> Iterator[bytes]:
+        """Serialize the annotation list as JSON in chunks, one per search
+        hit. See `Manifest.iter_json()`.
+
+        The search hits are retrieved before the first chunk is generated."""
+        annotations = self.annotations
+        yield _open_list(self._json_without_resources(with_context), 'resources')
+        for n, annotation in enumerate(annotations):
+            yield (b',' if n > 0 else b'') + orjson.dumps(annotation.json())
+        yield b']}'
+
+
+SEARCH_RESULT_TYPES = ('oa:Annotation', 'umd:searchResult')
+"""JSON-LD types of a search result annotation. Shared by all instances,
+so it is a tuple (serialized as a JSON array) rather than a list."""
+
 
 class SearchResult:
     """IIIF Annotation of a single search result"""
@@ -411,10 +640,7 @@ class SearchResult:
     def json(self) -> dict[str, Any]:
         return {
             '@id': self.uri,
-            '@type': [
-                'oa:Annotation',
-                'umd:searchResult',
-            ],
+            '@type': SEARCH_RESULT_TYPES,
             'motivation': 'oa:highlighting',
             'on': {
                 '@type': 'oa:SpecificResource',
@@ -437,6 +663,20 @@ class PresentationContext:
     image_service: ImageService
     endpoint_url: str
     logo_url: str
+    resource_cache: LRUCache[tuple[str, str | None], Resource] | None = None
+    """Recently retrieved resources, keyed by manifest ID and text query.
+    If `None` (the default), every call to `get_resource()` queries Solr.
+    Cached resources are shared by concurrent requests; their properties
+    are computed without locking, so two requests may both compute the same
+    property, with equivalent results."""
+    manifest_cache: LRUCache[tuple[str, str | None, bool], Manifest] | None = None
+    """Recently created manifests, keyed by manifest ID, text query, and
+    whether they include text matches. Reusing a manifest also reuses the
+    sequences, canvases, and images that have already been built for it.
+    A cached manifest is only reused while its resource is still the one
+    returned by `get_resource()`, so it never outlives the cached resource.
+    If `None` (the default), every call to `get_manifest()` creates a new
+    manifest."""
 
     def get_resource_uri(self, iiif_id: str) -> str:
         try:
@@ -450,13 +690,44 @@ class PresentationContext:
         except URLError as e:
             raise ManifestNotAvailable(uri=resource_uri) from e
 
-    def get_resource(self, manifest_id: str) -> Resource:
+    def get_resource(self, manifest_id: str, text_query: str = None) -> Resource:
+        key = (manifest_id, text_query)
+        if self.resource_cache is not None and (resource := self.resource_cache.get(key)) is not None:
+            return resource
         try:
-            return self.solr_service.get_resource(self.get_resource_uri(manifest_id))
+            resource = self.solr_service.get_resource(self.get_resource_uri(manifest_id), text_query)
         except SolrDocumentNotFound as e:
             raise ManifestNotFound(id=manifest_id) from e
         except SolrLookupError as e:
             raise ServiceProblem from e
-
-    def get_manifest(self, manifest_id: str, text_query: str = None) -> Manifest:
-        return Manifest(ctx=self, id=manifest_id, text_query=text_query)
+        if self.resource_cache is not None:
+            self.resource_cache[key] = resource
+        return resource
+
+    def forget(self, manifest_id: str):
+        """Discard the cached resources and manifests for `manifest_id`, for
+        all text queries, so that the next request retrieves the resource
+        from Solr again."""
+        for cache in (self.resource_cache, self.manifest_cache):
+            if cache is None:
+                continue
+            for key in cache.keys():
+                if key[0] == manifest_id:
+                    cache.pop(key)
+
+    def get_manifest(self, manifest_id: str, text_query: str = None, with_text_matches: bool = False) -> Manifest:
+        if self.manifest_cache is None:
+            return Manifest(ctx=self, id=manifest_id, text_query=text_query, with_text_matches=with_text_matches)
+        key = (manifest_id, text_query, with_text_matches)
+        resource = self.get_resource(manifest_id, text_query if with_text_matches else None)
+        manifest = self.manifest_cache.get(key)
+        if manifest is None or manifest.resource is not resource:
+            manifest = Manifest(
+                ctx=self,
+                id=manifest_id,
+                text_query=text_query,
+                with_text_matches=with_text_matches,
+                resource=resource,
+            )
+            self.manifest_cache[key] = manifest
+        return manifest
@@ -9,6 +9,10 @@ from papaya.web import create_app
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_THREADS = 16
+"""Requests mostly wait on Solr and the IIIF Image API server, so use
+more threads than waitress's default of 4."""
+
 
 @click.command()
 @click.option(
@@ -17,9 +21,15 @@ logger = logging.getLogger(__name__)
     help='Address and port to listen on. Default is "0.0.0.0:5000".',
     metavar='[ADDRESS]:PORT',
 )
+@click.option(
+    '--threads',
+    default=DEFAULT_THREADS,
+    type=click.IntRange(min=1),
+    help=f'Number of threads to handle requests with. Default is {DEFAULT_THREADS}.',
+)
 @click.version_option(__version__, '--version', '-V')
 @click.help_option('--help', '-h')
-def run(listen):
+def run(listen, threads):
     load_dotenv()
     server_identity = f'papaya/{__version__}'
     logger.info(f'Starting {server_identity}')
@@ -27,6 +37,7 @@ def run(listen):
         serve(
             app=create_app(),
             listen=listen,
+            threads=threads,
             ident=server_identity,
         )
     except (OSError, RuntimeError) as e:
@@ -0,0 +1,25 @@
+import requests
+from requests.adapters import HTTPAdapter, Retry
+
+
+def create_session(pool_size: int = 32, retries: int = 0) -> requests.Session:
+    """Create a `requests.Session` that keeps up to `pool_size` connections
+    per host open for reuse, and retries failed connections up to `retries`
+    times, with a short backoff.
+
+    ```pycon
+    >>> session = create_session(pool_size=8, retries=2)
+    >>> session.get_adapter('https://example.com/').max_retries.total
+    2
+
+    ```
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=Retry(total=retries, backoff_factor=0.1) if retries else 0,
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
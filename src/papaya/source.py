@@ -15,7 +15,10 @@ structure and basic manifest metadata:
   them using the string `' / '`
 * **`$page_uris`** Returns a list of page URIs in page order
 * **`$page_image_ids`** Returns a list of IIIF Image IDs for the pages,
-  in the same order as the `$page_uris`
+  in the same order as the `$page_uris`. The two lists are parallel: the
+  image for the page at a given position in `$page_uris` is the image ID
+  at the same position in `$page_image_ids`, so there must be exactly one
+  image ID per page
 
 Metadata queries whose keys begin with `$*` all take arguments at
 runtime:
@@ -68,8 +71,8 @@ Would yield this metadata mapping in the output manifest:
 """
 
 import logging
-import re
-from collections.abc import Mapping
+from collections.abc import Mapping, Sequence
+from functools import cached_property, lru_cache
 from typing import NamedTuple, Any
 from urllib.parse import parse_qsl
 from uuid import uuid4
@@ -78,18 +81,60 @@ import jq
 import pysolr
 from jq import _Program, _ProgramWithInput  # noqa
 
+from papaya.sessions import create_session
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_SOLR_TIMEOUT = 60
+VERSION_FIELD = '_version_'
+"""Solr field that holds the document version."""
+
+# unique tag used to mark the parts of the highlighting snippets that
+# we want to extract into annotations; it is random so that it cannot
+# occur in the text itself, but only needs to be generated once
+_MATCH_TAG = f'<<{uuid4()}>>'
+
+
+@lru_cache(maxsize=None)
+def _compile_jq(query: str) -> _Program:
+    # the set of metadata queries is fixed by the configuration, and compiled
+    # programs can be safely shared, so each query only needs to be compiled once
+    return jq.compile(query)
+
+
+def _compile_jq_with_uri(query: str) -> _Program:
+    # jq binds named arguments at compile time, so instead of compiling the
+    # query once per URI, compile it once with a wrapper that takes the URI
+    # and the document from an input of the form {"uri": ..., "doc": ...}
+    return _compile_jq(f'.uri as $uri | .doc | (\n{query}\n)')
+
+
+def _compile_jq_for_each_uri(query: str) -> _Program:
+    # run the query once for each URI in an input of the form
+    # {"uris": [...], "doc": ...}, returning an array with the
+    # first result (or null) for each URI, in the same order
+    return _compile_jq(f'.doc as $doc | [.uris[] as $uri | $doc | [(\n{query}\n)] | .[0]]')
 
-def format_value(value: str) -> dict[str, str] | str:
-    """If the given `value` starts with a language tag `[@{language}]`
-    (e.g., `[@de]` or `[@ja-latn]`, extracts the language from the tag
-    and returns a JSON-LD-style dictionary with `@language` and `@value`
-    keys. Otherwise, just returns the unmodified `value`."""
-    if m := re.match(r'\[@(.*?)](.*)', value):
-        return {'@language': m[1], '@value': m[2]}
-    else:
+
+@lru_cache(maxsize=None)
+def _compile_jq_batch(queries: tuple[str, ...]) -> _Program:
+    # combine the queries into a single program that returns an array
+    # with an array of the results of each query, in the same order
+    return _compile_jq('[' + ', '.join(f'[(\n{query}\n)]' for query in queries) + ']')
+
+
+def format_value(value: Any) -> dict[str, str] | Any:
+    """If the given `value` is a string that starts with a language tag
+    `[@{language}]` (e.g., `[@de]` or `[@ja-latn]`, extracts the language
+    from the tag and returns a JSON-LD-style dictionary with `@language`
+    and `@value` keys. Otherwise, just returns the unmodified `value`."""
+    if not isinstance(value, str) or not value.startswith('[@'):
+        return value
+    end = value.find(']', 2)
+    # no closing bracket, or an empty language
+    if end < 3:
         return value
+    return {'@language': value[2:end], '@value': value[end + 1 :]}
 
 
 class RepositoryService:
@@ -116,6 +161,9 @@ class RepositoryService:
         """Character to replace the `'/'` path separator when converting from URI
         to IIIF ID, and to convert to `'/'` when going the other way. Defaults to
         `':'`."""
+        self._endpoint_slash = endpoint + '/'
+        self._to_iiif_id = str.maketrans({'/': path_sep})
+        self._to_repo_path = str.maketrans({path_sep: '/'})
 
     def get_resource_uri(self, iiif_id: str) -> str:
         """Converts a IIIF ID to a repository URI.
@@ -125,19 +173,17 @@ class RepositoryService:
         if not iiif_id.startswith(self.prefix):
             logger.error(f'Invalid IIIF ID: Expecting "{self.prefix}<local part>", got "{iiif_id}"')
             raise IdentifierError(iiif_id)
-        local_part = iiif_id.removeprefix(self.prefix)
-        repo_path = '/' + local_part.replace(self.path_sep, '/')
-        return self.endpoint + repo_path
+        return self._endpoint_slash + iiif_id[len(self.prefix) :].translate(self._to_repo_path)
 
     def get_iiif_id(self, resource_uri: str) -> str:
         """Converts a repository URI to a IIIF ID.
 
-        If the `resource_uri` does not start with the `endpoint`, raises a
+        If the `resource_uri` is not a path below the `endpoint`, raises a
         `URLError` exception."""
-        if not resource_uri.startswith(self.endpoint):
+        if not resource_uri.startswith(self._endpoint_slash):
             logger.error(f'{resource_uri} not part of configured repository {self.endpoint}')
             raise URLError(resource_uri)
-        return resource_uri.replace(f'{self.endpoint}/', self.prefix).replace('/', self.path_sep)
+        return self.prefix + resource_uri[len(self._endpoint_slash) :].translate(self._to_iiif_id)
 
 
 class IdentifierError(ValueError):
@@ -148,30 +194,54 @@ class URLError(ValueError):
     """There was a problem with a resource URI."""
 
 
+class PageImageError(ValueError):
+    """A page of a resource has no corresponding image ID."""
+
+
 class Resource:
     """A digital object that has a IIIF manifest."""
 
-    def __init__(self, doc: Mapping[str, Any], metadata_queries: Mapping[str, str] = None):
+    def __init__(
+        self,
+        doc: Mapping[str, Any],
+        metadata_queries: Mapping[str, str] = None,
+        text_matches: list[TaggedText] = None,
+    ):
         self.doc = doc
         """Mapping of digital object metadata. Typically a Solr document."""
+        self.text_matches = text_matches
+        """Text matches for a query, if they were retrieved together with
+        the document. See `SolrService.get_doc_with_highlighting()`."""
         self.metadata_queries = metadata_queries or {}
         """Mapping of short keys to `jq` expressions. Used for constructing
         the metadata and structure of the IIIF manifest. See
         [Metadata Queries](#metadata-queries) for more details and a list of
         expected keys."""
         self._jq_programs: dict[str, _Program] = {
-            k: jq.compile(v) for k, v in self.metadata_queries.items() if not k.startswith('$*')
+            k: _compile_jq(v) for k, v in self.metadata_queries.items() if not k.startswith('$*')
         }
+        # results of the $* queries, keyed by (query key, URI)
+        self._results_by_uri: dict[tuple[str, str], Any] = {}
 
     def _query(self, key: str) -> _ProgramWithInput:
         return self._jq_programs[key].input_value(self.doc)
 
-    @property
+    def _query_with_uri(self, key: str, uri: str) -> _ProgramWithInput:
+        return _compile_jq_with_uri(self.metadata_queries[key]).input_value({'uri': uri, 'doc': self.doc})
+
+    def _first_with_uri(self, key: str, uri: str) -> Any:
+        try:
+            return self._results_by_uri[key, uri]
+        except KeyError:
+            result = self._results_by_uri[key, uri] = self._query_with_uri(key, uri).first()
+            return result
+
+    @cached_property
     def uri(self) -> str:
         """URI of the digital object. Metadata query key: `$uri`"""
         return self._query('$uri').first()
 
-    @property
+    @cached_property
     def label(self) -> str:
         """Label for the manifest. Metadata query key: `$label`
 
@@ -179,7 +249,7 @@ class Resource:
         using the string `' / '`."""
         return ' / '.join(self._query('$label'))
 
-    @property
+    @cached_property
     def page_uris(self) -> list[str]:
         """List of URIs of the individual pages of the digital object.
         Metadata query key: `$page_uris`
@@ -187,18 +257,27 @@ class Resource:
         These should be in the desired presentation order."""
         return self._query('$page_uris').all()
 
-    @property
+    @cached_property
+    def page_image_ids(self) -> list[str]:
+        """List of IIIF Image IDs of the images to display for each page.
+        Metadata query key: `$page_image_ids`
+
+        This is parallel to `page_uris`: there should be exactly one image ID
+        for each page, in the same order."""
+        return self._query('$page_image_ids').all()
+
+    @cached_property
     def date(self) -> str:
         """Navigation date (`navDate`) for the manifest. Metadata query
         key: `$date`"""
         return self._query('$date').first()
 
-    @property
+    @cached_property
     def license(self) -> str:
         """License URL for the manifest. Metadata query key: `$license_uri`"""
         return self._query('$license_uri').first()
 
-    @property
+    @cached_property
     def description(self) -> str:
         """Description for the manifest. Metadata query key: `$description`
 
@@ -206,7 +285,7 @@ class Resource:
         using the string `' / '`."""
         return ' / '.join(self._query('$description'))
 
-    @property
+    @cached_property
     def metadata(self) -> list[dict]:
         """Descriptive metadata for the manifest.
 
@@ -215,40 +294,100 @@ class Resource:
         the field, and the returned value or values from the query are processed
         by `format_language_tag` and become the value of the field."""
         keys = [k for k in self.metadata_queries.keys() if not k.startswith('$')]
-        metadata = [{'label': k, 'value': [format_value(v) for v in self._query(k) if v is not None]} for k in keys]
-        return [m for m in metadata if m['value']]
+        if not keys:
+            return []
+        # run all the queries as one program, so that the document
+        # is only converted to a jq value once
+        program = _compile_jq_batch(tuple(self.metadata_queries[k] for k in keys))
+        results = program.input_value(self.doc).first()
+        metadata = []
+        for k, values in zip(keys, results):
+            if value := [format_value(v) for v in values if v is not None]:
+                metadata.append({'label': k, 'value': value})
+        return metadata
+
+    @property
+    def version(self) -> int | None:
+        """Version of the digital object's metadata, taken from the Solr
+        `_version_` field. Changes whenever the document is updated. Is
+        `None` if the document does not have a version."""
+        return self.doc.get(VERSION_FIELD)
 
     def index(self, page_uri: str) -> int:
         """Given a page URI, return the (0-based) index of that page in the
-        sequential list of `page_uris`"""
-        return self.page_uris.index(page_uri)
+        sequential list of `page_uris`. Raises a `ValueError` if `page_uri`
+        is not one of the `page_uris`."""
+        try:
+            return self._page_index[page_uri]
+        except KeyError:
+            raise ValueError(f'{page_uri} is not a page of {self.uri}') from None
+
+    @cached_property
+    def _page_index(self) -> dict[str, int]:
+        # like list.index(), a repeated page URI maps to its first position
+        page_index = {}
+        for index, page_uri in enumerate(self.page_uris):
+            page_index.setdefault(page_uri, index)
+        return page_index
 
     def get_page_doc(self, page_uri: str) -> dict:
         """Given a page URI, returns the mapping of metadata of that single page.
         Metadata query key: `$*page_doc`. The given `page_uri` is passed to the
         query as the `$uri` argument."""
-        program: _Program = jq.compile(self.metadata_queries['$*page_doc'], args={'uri': page_uri})
-        return program.input_value(self.doc).first()
+        return self._first_with_uri('$*page_doc', page_uri)
 
     def find_page_doc(self, file_uri: str) -> dict:
         """Given a file URI, returns the mapping of metadata of the single page
         that contains that file. Metadata query key: `$*file_page_uri`. The given
         `file_uri` is passed to the query as the `$uri` argument."""
-        program: _Program = jq.compile(self.metadata_queries['$*file_page_uri'], args={'uri': file_uri})
-        return program.input_value(self.doc).first()
+        return self._first_with_uri('$*file_page_uri', file_uri)
 
     def get_page_image_id(self, page_uri: str) -> str:
         """Given a page URI, returns the IIIF ID of the image that should be
-        displayed on that page. Metadata query key: `$page_image_ids`. The
-        given `page_uri` is passed to the query as the `$uri` argument."""
-        return self._query('$page_image_ids').all()[self.index(page_uri)]
+        displayed on that page, by matching up the `page_uris` with the
+        `page_image_ids`. Raises a `ValueError` if `page_uri` is not one of
+        the `page_uris`, or a `PageImageError` if it is a page, but there
+        is no image ID at its position in the `page_image_ids`."""
+        try:
+            return self._image_by_page[page_uri]
+        except KeyError:
+            pass
+        index = self.index(page_uri)
+        raise PageImageError(
+            f'{page_uri} (page index {index}) has no image ID; {self.uri} has {len(self.page_uris)} page URIs '
+            f'but {len(self.page_image_ids)} page image IDs'
+        )
+
+    @cached_property
+    def _image_by_page(self) -> dict[str, str]:
+        if len(self.page_uris) != len(self.page_image_ids):
+            logger.warning(
+                f'{self.uri} has {len(self.page_uris)} page URIs but {len(self.page_image_ids)} page image IDs; '
+                'check the $page_uris and $page_image_ids metadata queries'
+            )
+        # a repeated page URI gets the image at its first position, as with
+        # looking up the image ID by the page's index()
+        image_by_page = {}
+        for page_uri, image_id in zip(self.page_uris, self.page_image_ids):
+            image_by_page.setdefault(page_uri, image_id)
+        return image_by_page
 
     def get_page_label(self, page_uri: str) -> str:
         """Given a page URI, returns the value to use as the label for that page.
         Metadata query key: `$*page_label`. The given `page_uri` is passed to the
         query as the `$uri` argument."""
-        program: _Program = jq.compile(self.metadata_queries['$*page_label'], args={'uri': page_uri})
-        return program.input_value(self.doc).first()
+        try:
+            return self._page_labels[page_uri]
+        except KeyError:
+            return self._first_with_uri('$*page_label', page_uri)
+
+    @cached_property
+    def _page_labels(self) -> dict[str, str]:
+        # manifests need the labels of all the pages, so get them with a
+        # single query instead of converting the document once per page
+        program = _compile_jq_for_each_uri(self.metadata_queries['$*page_label'])
+        labels = program.input_value({'uris': self.page_uris, 'doc': self.doc}).first()
+        return dict(zip(self.page_uris, labels))
 
 
 class SolrLookupError(Exception):
@@ -264,7 +403,13 @@ class SolrService:
     to use to build the IIIF manifest."""
 
     def __init__(
-        self, endpoint: str, metadata_queries: Mapping[str, str], text_match_field: str, uri_field: str = 'id'
+        self,
+        endpoint: str,
+        metadata_queries: Mapping[str, str],
+        text_match_field: str,
+        uri_field: str = 'id',
+        timeout: float = DEFAULT_SOLR_TIMEOUT,
+        field_list: str | Sequence[str] = None,
     ):
         self.endpoint = endpoint
         """URL of the Solr core to use. Must have a '/select' query handler."""
@@ -277,8 +422,37 @@ class SolrService:
         """Name of the Solr field containing tagged text data."""
         self.uri_field = uri_field
         """Name of the Solr field containing the resource URI. Defaults to `'id'`."""
-
-        self._solr = pysolr.Solr(self.endpoint)
+        self.timeout = timeout
+        """Number of seconds to wait for a response from Solr. Defaults to 60."""
+        if field_list is not None:
+            if isinstance(field_list, str):
+                field_list = [name.strip() for name in field_list.split(',')]
+            # the version is needed for ETags and response caching
+            if VERSION_FIELD not in field_list:
+                field_list = [*field_list, VERSION_FIELD]
+            field_list = ','.join(field_list)
+        self.field_list = field_list
+        """Solr field list (`fl`) to request, as a comma-separated string. Limits
+        the size of the retrieved documents; it must include every field that
+        the `metadata_queries` use. The `_version_` field is always added.
+        Defaults to `None`, which returns all stored fields."""
+
+        # compile all the queries up front, so that configuration errors are
+        # reported at startup, and no request has to wait for compilation;
+        # jq raises a ValueError for an invalid query
+        for key, query in self.metadata_queries.items():
+            if key.startswith('$*'):
+                _compile_jq_with_uri(query)
+            else:
+                _compile_jq(query)
+        if '$*page_label' in self.metadata_queries:
+            _compile_jq_for_each_uri(self.metadata_queries['$*page_label'])
+        if descriptive_queries := tuple(v for k, v in self.metadata_queries.items() if not k.startswith('$')):
+            _compile_jq_batch(descriptive_queries)
+
+        # reuse connections across requests, and retry briefly
+        # if a connection to the server fails
+        self._solr = pysolr.Solr(self.endpoint, session=create_session(retries=2), timeout=timeout)
 
     def get_doc(self, resource_uri: str) -> dict:
         """Retrieve the Solr document whose `uri_field` value matches the given `resource_uri`.
@@ -287,22 +461,77 @@ class SolrService:
         than one document is found, or there is some other error sending the request
         to Solr, raises a `SolrLookupError` exception."""
         try:
-            # use the term query parser and pass the URI as a regular query parameter
-            # so that Solr itself will handle the escaping of the URI value
-            results = self._solr.search(q=f'{{!term f={self.uri_field} v=$id}}', id=resource_uri)
+            results = self._search(resource_uri)
         except pysolr.SolrError as e:
             raise SolrLookupError(str(e)) from e
 
-        if len(results) == 0:
+        return self._get_single_doc(results, resource_uri)
+
+    def _search(self, resource_uri: str, **params) -> pysolr.Results:
+        if self.field_list is not None:
+            params['fl'] = self.field_list
+        # use the term query parser and pass the URI as a regular query parameter
+        # so that Solr itself will handle the escaping of the URI value
+        return self._solr.search(q=f'{{!term f={self.uri_field} v=$id}}', id=resource_uri, rows=2, **params)
+
+    @staticmethod
+    def _get_single_doc(results: pysolr.Results, resource_uri: str) -> dict:
+        # use the total number of matches reported by Solr, since
+        # the search only returns enough rows to detect duplicates
+        if results.hits == 0:
             raise SolrDocumentNotFound(f'No document with id "{resource_uri}" found')
-        if len(results) > 1:
+        if results.hits > 1:
             raise SolrLookupError(f'Multiple documents with id "{resource_uri}" found')
 
         return results.docs[0]
 
-    def get_resource(self, resource_uri: str) -> Resource:
-        """Get the `Resource` object representing the given `resource_uri`."""
-        return Resource(self.get_doc(resource_uri), self.metadata_queries)
+    def get_resource(self, resource_uri: str, text_query: str = None) -> Resource:
+        """Get the `Resource` object representing the given `resource_uri`.
+
+        If `text_query` is given, the text matches for that query are retrieved
+        in the same request as the document, and stored in the `text_matches`
+        of the `Resource`."""
+        if text_query is None:
+            return Resource(self.get_doc(resource_uri), self.metadata_queries)
+        doc, text_matches = self.get_doc_with_highlighting(resource_uri, text_query)
+        return Resource(doc, self.metadata_queries, text_matches)
+
+    def _highlighting_params(self, text_query: str, match_tag: str) -> dict[str, Any]:
+        return {
+            'hl': 'on',
+            'hl.fl': self.text_match_field,
+            'hl.q': f'{self.text_match_field}:{text_query}',
+            'hl.snippets': 100,
+            'hl.fragsize': 50,
+            'hl.maxAnalyzedChars': 1_000_000,
+            'hl.tag.pre': match_tag,
+            'hl.tag.post': match_tag,
+        }
+
+    def _search_with_highlighting(
+        self, resource_uri: str, text_query: str, index: int = None
+    ) -> tuple[pysolr.Results, list[TaggedText]]:
+        match_tag = _MATCH_TAG
+        try:
+            results = self._search(resource_uri, **self._highlighting_params(text_query, match_tag))
+        except pysolr.SolrError as e:
+            raise SolrLookupError(str(e)) from e
+
+        snippets = results.highlighting.get(resource_uri, {}).get(self.text_match_field, [])
+        parse = TaggedText.parse
+        hits = []
+        if index is None:
+            for text in snippets:
+                # the matches are between the opening and closing match tags,
+                # so they are every other part, starting with the second one
+                hits.extend(parse(x) for x in text.split(match_tag)[1::2])
+        else:
+            # only parse the matches that could be on the requested page;
+            # any form of the page number (e.g., "01") contains its digits
+            digits = str(index)
+            for text in snippets:
+                hits.extend(hit for x in text.split(match_tag)[1::2] if digits in x and (hit := parse(x)).page == index)
+        return results, hits
 
     def get_text_matches(self, resource_uri: str, text_query: str, index: int = None) -> list[TaggedText]:
         """Search the `text_match_field` of the resource with the given `resource_uri`
@@ -310,36 +539,15 @@ class SolrService:
         a list of `TaggedText` objects that represent each instance that matched.
 
         If `index` is given, limit the results to only those on the page with that `index`."""
+        _, hits = self._search_with_highlighting(resource_uri, text_query, index)
+        return hits
 
-        # use a unique match tag to mark the parts of the snippets
-        # we want to extract into annotations
-        match_tag = f'<<{uuid4()}>>'
-        try:
-            results = self._solr.search(
-                q=f'{{!term f={self.uri_field} v=$id}}',
-                id=resource_uri,
-                hl='on',
-                **{
-                    'hl.fl': self.text_match_field,
-                    'hl.q': f'{self.text_match_field}:{text_query}',
-                    'hl.snippets': 100,
-                    'hl.fragsize': 50,
-                    'hl.maxAnalyzedChars': 1_000_000,
-                    'hl.tag.pre': match_tag,
-                    'hl.tag.post': match_tag,
-                },
-            )
-        except pysolr.SolrError as e:
-            raise SolrLookupError(str(e)) from e
-
-        hits = []
-        for text in results.highlighting[resource_uri].get(self.text_match_field, []):
-            hits.extend(TaggedText.parse(x) for i, x in enumerate(text.split(match_tag)) if i % 2 == 1)
-
-        if index is not None:
-            return [h for h in hits if int(h.params['n']) == index]
-        else:
-            return hits
+    def get_doc_with_highlighting(self, resource_uri: str, text_query: str) -> tuple[dict, list[TaggedText]]:
+        """Retrieve both the Solr document for the given `resource_uri` (as in
+        `get_doc()`) and the text matches for the `text_query` (as in
+        `get_text_matches()`), using a single Solr request."""
+        results, hits = self._search_with_highlighting(resource_uri, text_query)
+        return self._get_single_doc(results, resource_uri), hits
 
 
 class TaggedText(NamedTuple):
@@ -348,13 +556,35 @@ class TaggedText(NamedTuple):
     params: dict[str, Any]
     """Parameters mapping from the token"""
 
+    @property
+    def page(self) -> int | None:
+        """Index of the page that the token is on, from the `n` parameter.
+        Like `int()`, this accepts forms such as `01` or `1 `. `None` if
+        there is no `n` parameter, or it is not an integer."""
+        n = self.params.get('n')
+        if n is None:
+            return None
+        try:
+            return int(n)
+        except ValueError:
+            return None
+
     @classmethod
     def parse(cls, dps_string: str):
         """Splits `dps_string` using `|`. The first part becomes the `text`,
         and the second part is parsed as an HTTP query string and becomes
-        the `params` dictionary."""
-        text, tag = dps_string.split('|', 1)
-        return cls(
-            text=text,
-            params=dict(parse_qsl(tag)),
-        )
+        the `params` dictionary. Raises a `ValueError` if there is no `|`."""
+        text, sep, tag = dps_string.partition('|')
+        if not sep:
+            raise ValueError(f'Missing "|" separator in tagged text "{dps_string}"')
+        if '%' in tag or '+' in tag:
+            params = dict(parse_qsl(tag))
+        else:
+            # nothing to decode, so skip the general-purpose parser; like
+            # parse_qsl, this ignores parameters with blank values
+            params = {}
+            for pair in tag.split('&'):
+                key, _, value = pair.partition('=')
+                if value:
+                    params[key] = value
+        return cls(text=text, params=params)
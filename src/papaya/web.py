@@ -1,13 +1,20 @@
+import hashlib
 import logging
 import os
 import re
+from collections.abc import Callable, Iterator
+from itertools import chain
 from http import HTTPStatus
-from urllib.parse import urlencode
+from typing import Any
+from urllib.parse import quote, urlencode
 
+import orjson
 from configurenv import load_config_from_files
-from flask import Flask, url_for, redirect, request
+from flask import Flask, Response, url_for, redirect, request
+from flask.json.provider import JSONProvider
 
 from papaya import __version__
+from papaya.cache import LRUCache
 from papaya.errors import (
     ProblemDetailError,
     problem_detail_response,
@@ -15,8 +22,17 @@ from papaya.errors import (
     CanvasNotFound,
     AnnotationNotFound,
 )
-from papaya.iiif2 import ImageService, DEFAULT_THUMBNAIL_WIDTH, PresentationContext, SearchHitsList
-from papaya.source import RepositoryService, SolrService
+from papaya.iiif2 import (
+    ImageService,
+    DEFAULT_THUMBNAIL_WIDTH,
+    DEFAULT_INFO_CACHE_SIZE,
+    DEFAULT_PREFETCH_WORKERS,
+    DEFAULT_IMAGE_TIMEOUT,
+    PresentationContext,
+    SearchHitsList,
+    Manifest,
+)
+from papaya.source import DEFAULT_SOLR_TIMEOUT, RepositoryService, SolrService
 
 debug_mode = int(os.environ.get('FLASK_DEBUG', '0'))
 logging.basicConfig(
@@ -25,6 +41,42 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+DEFAULT_MANIFEST_CACHE_SIZE = 512
+DEFAULT_RESPONSE_CACHE_SIZE = 4096
+DEFAULT_RESOURCE_CACHE_SIZE = 512
+DEFAULT_RESOURCE_CACHE_TTL = 60
+MANIFEST_RULE = '/manifests/<manifest_id>/manifest'
+OUTPUT_CONFIG_KEYS = (
+    'URL',
+    'LOGO_URL',
+    'THUMBNAIL_WIDTH',
+    'IIIF_IMAGE_ENDPOINT',
+    'FCREPO_ENDPOINT',
+    'FCREPO_PREFIX',
+    'SOLR_TEXT_MATCH_FIELD',
+    'METADATA_QUERIES',
+)
+"""Configuration keys whose values affect the content of the responses."""
+
+# the form only depends on the version, so it is built once
+MANIFESTS_FORM_HTML = f"""
+<html>
+  <head>
+    <title>Papaya</title>
+  </head>
+  <body>
+    <h1>Papaya</h1>
+    <form method="post" action="">
+      <label>URI: <input name="uri" type="text" size="80"/></label>
+      <label>Text query: <input name="text_query" type="text"/></label>
+      <button type="submit">Submit</button>
+    </form>
+    <hr/>
+    <p id="version">{__version__}</p>
+  </body>
+</html>
+""".encode()
+
 
 def expand_shortened_path(path: str) -> str:
     """Expand a `path` string containing a shortened IIIF ID. If there is no shortened
@@ -48,19 +100,66 @@ def expand_shortened_path(path: str) -> str:
     return path[:m.span()[0]] + f':{pairtree}:{m[1]}' + path[m.span()[1]:]
 
 
+def make_etag(*parts: Any) -> str:
+    """Opaque entity tag for a response that is fully determined by the
+    given `parts` (e.g., an identifier, a query, and a resource version).
+
+    ```pycon
+    >>> make_etag('fcrepo:123', None, 42) == make_etag('fcrepo:123', None, 42)
+    True
+
+    >>> make_etag('fcrepo:123', None, 42) == make_etag('fcrepo:123', None, 43)
+    False
+
+    ```
+    """
+    return hashlib.blake2b('\x1f'.join(map(str, parts)).encode(), digest_size=16).hexdigest()
+
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider that uses [orjson](https://github.com/ijl/orjson)
+    for serialization and deserialization."""
+
+    def dumps(self, obj: Any, **kwargs) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s: str | bytes, **kwargs) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs) -> Response:
+        # use the bytes from orjson as the body directly, instead of
+        # decoding them to a str in dumps() only to have them encoded again
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS), mimetype='application/json')
+
+
 def create_app():
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
     app.config.from_prefixed_env('PAPAYA')
     load_config_from_files(app.config)
 
     app.logger.info(f'papaya/{__version__}')
     app.logger.debug(app.config)
 
+    # resources and manifests are reused for a short time, so that the requests
+    # for a manifest and its components do not each have to query Solr and
+    # rebuild the manifest
+    resource_cache_ttl = app.config.get('RESOURCE_CACHE_TTL', DEFAULT_RESOURCE_CACHE_TTL)
+    resource_cache_size = app.config.get('RESOURCE_CACHE_SIZE', DEFAULT_RESOURCE_CACHE_SIZE)
+    if resource_cache_ttl > 0:
+        resource_cache = LRUCache(maxsize=resource_cache_size, ttl=resource_cache_ttl)
+        manifest_object_cache = LRUCache(maxsize=resource_cache_size, ttl=resource_cache_ttl)
+    else:
+        resource_cache = manifest_object_cache = None
+
     ctx = PresentationContext(
         solr_service=SolrService(
             endpoint=app.config['SOLR_ENDPOINT'],
             metadata_queries=app.config.get('METADATA_QUERIES', {}),
             text_match_field=app.config['SOLR_TEXT_MATCH_FIELD'],
+            timeout=app.config.get('SOLR_TIMEOUT', DEFAULT_SOLR_TIMEOUT),
+            field_list=app.config.get('SOLR_FIELD_LIST', None),
         ),
         repo_service=RepositoryService(
             endpoint=app.config['FCREPO_ENDPOINT'],
@@ -69,10 +168,116 @@ def create_app():
         image_service=ImageService(
             endpoint=app.config['IIIF_IMAGE_ENDPOINT'],
             thumbnail_width=app.config.get('THUMBNAIL_WIDTH', DEFAULT_THUMBNAIL_WIDTH),
+            info_cache_size=app.config.get('IMAGE_INFO_CACHE_SIZE', DEFAULT_INFO_CACHE_SIZE),
+            prefetch_workers=app.config.get('IMAGE_PREFETCH_WORKERS', DEFAULT_PREFETCH_WORKERS),
+            timeout=app.config.get('IIIF_IMAGE_TIMEOUT', DEFAULT_IMAGE_TIMEOUT),
         ),
         endpoint_url=app.config['URL'],
         logo_url=app.config.get('LOGO_URL', None),
+        resource_cache=resource_cache,
+        manifest_cache=manifest_object_cache,
+    )
+    # serialized manifests, keyed by (request path, text query, resource version, output version)
+    manifest_cache: LRUCache[tuple, bytes] = LRUCache(
+        maxsize=app.config.get('MANIFEST_CACHE_SIZE', DEFAULT_MANIFEST_CACHE_SIZE)
     )
+    # serialized sequences, canvases, and other manifest components, keyed by
+    # (request path, text query, resource version, output version)
+    response_cache: LRUCache[tuple, bytes] = LRUCache(
+        maxsize=app.config.get('RESPONSE_CACHE_SIZE', DEFAULT_RESPONSE_CACHE_SIZE)
+    )
+
+    def load_manifest(manifest_id: str, text_query: str = None, with_text_matches: bool = False) -> Manifest:
+        """Get the manifest from the presentation context. If the request has
+        a `recache=1` parameter, first discards the cached resources and
+        manifests for `manifest_id`, so that the resource is retrieved from
+        Solr again."""
+        if recache_requested():
+            ctx.forget(manifest_id)
+        return ctx.get_manifest(manifest_id, text_query, with_text_matches=with_text_matches)
+
+    def recache_requested() -> bool:
+        """Whether the request asks to rebuild its response instead of using
+        a cached copy."""
+        return request.args.get('recache') == '1'
+
+    def manifest_url(manifest_id: str, external: bool = False) -> str:
+        """URL of the manifest with the given `manifest_id`. Equivalent to
+        `url_for('get_manifest', manifest_id=manifest_id, _external=external)`,
+        but formats the path directly instead of building it from the URL map."""
+        if app.config.get('SERVER_NAME'):
+            # url_for() takes the configured server name into account
+            return url_for('get_manifest', manifest_id=manifest_id, _external=external)
+        # quote the ID the same way the default route converter does
+        path = request.script_root + MANIFEST_RULE.replace('<manifest_id>', quote(manifest_id, safe="!$&'()*+,/:;=@"))
+        return request.host_url[:-1] + path if external else path
+
+    def streaming_response(chunks: Iterator[bytes], cache: LRUCache[tuple, bytes], key: tuple | None) -> Response:
+        """JSON response that streams the `chunks`. Once all of them have been
+        sent, the complete body is stored in `cache` under `key`, unless `key`
+        is `None`. If generating a later chunk fails, the error is logged and
+        re-raised, so that the server aborts the response instead of ending it
+        as if it were complete, and nothing is cached."""
+        # generate the first chunk now, so that any problems retrieving
+        # the resource or its images are reported as error responses
+        # instead of interrupting the stream
+        first_chunk = next(chunks)
+        # the request context is gone by the time the rest is generated
+        path = request.path
+
+        def generate():
+            body = []
+            try:
+                for chunk in chain((first_chunk,), chunks):
+                    body.append(chunk)
+                    yield chunk
+            except Exception:
+                app.logger.exception(f'Error while streaming the response for {path}; response is incomplete')
+                raise
+            if key is not None:
+                cache[key] = b''.join(body)
+
+        return app.response_class(generate(), mimetype='application/json')
+
+    # responses also depend on the code and the configuration, so that an ETag
+    # or cached body from before an upgrade or a configuration change is not reused
+    output_version = make_etag(__version__, *(app.config.get(key) for key in OUTPUT_CONFIG_KEYS))
+
+    def conditional_response(
+        manifest: Manifest,
+        build: Callable[[], Any],
+        stream: bool = False,
+        cache: LRUCache[tuple, bytes] = response_cache,
+    ) -> Response:
+        """Response for the `manifest` or one of its components, with an ETag
+        derived from the request path, the manifest's text query, the resource
+        version, and the papaya version and configuration. If the request's `If-None-Match` header matches the
+        ETag, returns an empty `304 Not Modified` response without calling
+        `build`. Otherwise, the response body is the serialized return value
+        of `build`, which is stored in `cache` until the resource version
+        changes. If `stream` is true, `build` must return an iterator of
+        serialized JSON chunks, which are streamed to the client."""
+        version = manifest.resource.version
+        # without a version, there is no way to tell when a cached copy is
+        # stale; use the manifest's text query rather than the request's,
+        # since some components (e.g., annotations) do not depend on it
+        key = (request.path, manifest.text_query, version, output_version) if version is not None else None
+        if key is None:
+            return streaming_response(build(), cache, None) if stream else app.make_response(build())
+        etag = make_etag(*key)
+        # If-None-Match uses the weak comparison (RFC 9110, section 13.1.2),
+        # so that a validator weakened by a proxy or compression still matches
+        if request.if_none_match.contains_weak(etag):
+            response = app.response_class(status=HTTPStatus.NOT_MODIFIED)
+        elif not recache_requested() and (body := cache.get(key)) is not None:
+            response = app.response_class(body, mimetype='application/json')
+        elif stream:
+            response = streaming_response(build(), cache, key)
+        else:
+            response = app.make_response(build())
+            cache[key] = response.get_data()
+        response.set_etag(etag)
+        return response
 
     @app.before_request
     def rewrite_short_ids():
@@ -87,29 +292,13 @@ def create_app():
     @app.route('/manifests/', methods=['GET'])
     def manifests_form():
         """Provides a basic form to generate a IIIF manifest from a resource URL."""
-        return f"""
-        <html>
-          <head>
-            <title>Papaya</title>
-          </head>
-          <body>
-            <h1>Papaya</h1>
-            <form method="post" action="">
-              <label>URI: <input name="uri" type="text" size="80"/></label>
-              <label>Text query: <input name="text_query" type="text"/></label>
-              <button type="submit">Submit</button>
-            </form>
-            <hr/>
-            <p id="version">{__version__}</p>
-          </body>
-        </html>
-        """
+        return app.response_class(MANIFESTS_FORM_HTML, mimetype='text/html')
 
     @app.route('/manifests/', methods=['POST'])
     def find_manifest():
         """Redirects to the actual manifest URL using the resource URL submitted
         via the form."""
-        url = url_for('get_manifest', manifest_id=ctx.get_iiif_id(request.form['uri']), _external=True)
+        url = manifest_url(ctx.get_iiif_id(request.form['uri']), external=True)
         if text_query := request.form.get('text_query', None):
             url += f'?{urlencode({"q": text_query})}'
         return redirect(url, HTTPStatus.FOUND)
@@ -118,55 +307,68 @@ def create_app():
     @app.route('/manifests/<manifest_id>/manifest.json')
     def redirect_to_manifest(manifest_id: str):
         """Redirects requests for the manifest to its canonical URL."""
-        return redirect(url_for('get_manifest', manifest_id=manifest_id), HTTPStatus.MOVED_PERMANENTLY)
+        return redirect(manifest_url(manifest_id), HTTPStatus.MOVED_PERMANENTLY)
 
-    @app.route('/manifests/<manifest_id>/manifest')
+    @app.route(MANIFEST_RULE)
     def get_manifest(manifest_id: str):
         """Implements the manifest response.
 
         See also: https://iiif.io/api/presentation/2.1/#manifest"""
-        return ctx.get_manifest(manifest_id, request.args.get('q', None)).json(with_context=True)
+        manifest = load_manifest(manifest_id, request.args.get('q', None))
+        return conditional_response(
+            manifest, lambda: manifest.iter_json(with_context=True), stream=True, cache=manifest_cache
+        )
+
+    @app.route('/manifests/<manifest_id>/summary')
+    def get_manifest_summary(manifest_id: str):
+        """Abbreviated manifest, with the label and thumbnail but without
+        the sequences. Useful for list and preview displays that do not
+        need the full manifest."""
+        manifest = load_manifest(manifest_id, request.args.get('q', None))
+        return conditional_response(manifest, lambda: manifest.summary_json(with_context=True))
 
     @app.route('/manifests/<manifest_id>/sequence/<sequence_name>')
     def get_sequence(manifest_id: str, sequence_name: str):
         """Implements the sequence response.
 
         See also: https://iiif.io/api/presentation/2.1/#sequence"""
-        try:
-            manifest = ctx.get_manifest(manifest_id, request.args.get('q', None))
-            return manifest.find_sequence(sequence_name).json(with_context=True)
-        except KeyError as e:
-            raise SequenceNotFound(sequence_name=sequence_name, manifest_id=manifest_id) from e
+        manifest = load_manifest(manifest_id, request.args.get('q', None))
+        if not manifest.has_sequence(sequence_name):
+            raise SequenceNotFound(sequence_name=sequence_name, manifest_id=manifest_id)
+        return conditional_response(manifest, lambda: manifest.find_sequence(sequence_name).json(with_context=True))
 
     @app.route('/manifests/<manifest_id>/canvas/<canvas_name>')
     def get_canvas(manifest_id: str, canvas_name: str):
         """Implements the canvas response.
 
         See also: https://iiif.io/api/presentation/2.1/#canvas"""
-        try:
-            manifest = ctx.get_manifest(manifest_id, request.args.get('q', None))
-            return manifest.find_canvas(canvas_name).json(with_context=True)
-        except KeyError as e:
-            raise CanvasNotFound(canvas_name=canvas_name, manifest_id=manifest_id) from e
+        manifest = load_manifest(manifest_id, request.args.get('q', None))
+        if not manifest.has_canvas(canvas_name):
+            raise CanvasNotFound(canvas_name=canvas_name, manifest_id=manifest_id)
+        return conditional_response(manifest, lambda: manifest.find_canvas(canvas_name).json(with_context=True))
 
     @app.route('/manifests/<manifest_id>/annotation/<annotation_name>')
     def get_annotation(manifest_id: str, annotation_name: str):
         """Implements the image resource response.
 
         See also: https://iiif.io/api/presentation/2.1/#image-resources"""
-        try:
-            return ctx.get_manifest(manifest_id).find_annotation(annotation_name).json(with_context=True)
-        except KeyError as e:
-            raise AnnotationNotFound(annotation_name=annotation_name, manifest_id=manifest_id) from e
+        manifest = load_manifest(manifest_id)
+        if not manifest.has_annotation(annotation_name):
+            raise AnnotationNotFound(annotation_name=annotation_name, manifest_id=manifest_id)
+        return conditional_response(manifest, lambda: manifest.find_annotation(annotation_name).json(with_context=True))
 
     @app.route('/manifests/<manifest_id>/list/<canvas_name>-search')
     def get_annotation_list(manifest_id: str, canvas_name: str):
-        try:
-            canvas = ctx.get_manifest(manifest_id).find_canvas(canvas_name)
-        except KeyError as e:
-            raise CanvasNotFound(canvas_name=canvas_name, manifest_id=manifest_id) from e
+        text_query = request.args.get('q')
+        # get the document and the text matches with a single Solr request
+        manifest = load_manifest(manifest_id, text_query, with_text_matches=True)
+        if not manifest.has_canvas(canvas_name):
+            raise CanvasNotFound(canvas_name=canvas_name, manifest_id=manifest_id)
+        canvas = manifest.find_canvas(canvas_name)
 
-        return SearchHitsList(canvas, request.args.get('q')).json(with_context=True)
+        return conditional_response(
+            manifest, lambda: SearchHitsList(canvas, text_query).iter_json(with_context=True), stream=True
+        )
 
     app.register_error_handler(ProblemDetailError, problem_detail_response)
 
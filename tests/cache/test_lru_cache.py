@@ -0,0 +1,53 @@
+import pytest
+
+from papaya.cache import LRUCache
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache['a'] = 1
+    cache['b'] = 2
+    # reading an item marks it as recently used
+    assert cache['a'] == 1
+    cache['c'] = 3
+    assert cache.keys() == ['a', 'c']
+
+
+def test_get_missing_key():
+    cache = LRUCache()
+    assert cache.get('missing') is None
+    assert cache.get('missing', 'default') == 'default'
+    with pytest.raises(KeyError):
+        _ = cache['missing']
+
+
+def test_delete_and_clear():
+    cache = LRUCache()
+    cache['a'] = 1
+    cache['b'] = 2
+    del cache['a']
+    assert len(cache) == 1
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_pop():
+    cache = LRUCache()
+    cache['a'] = 1
+    assert cache.pop('a') == 1
+    assert 'a' not in cache
+    assert cache.pop('a', 0) == 0
+
+
+def test_expires_items_after_ttl():
+    now = 0.0
+    cache = LRUCache(ttl=10, timer=lambda: now)
+    cache['a'] = 1
+    now = 5.0
+    cache['b'] = 2
+    assert cache['a'] == 1
+    now = 10.0
+    assert 'a' not in cache
+    assert cache.get('a') is None
+    assert cache.keys() == ['b']
+    assert cache['b'] == 2
@@ -0,0 +1,33 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier, RLock
+from time import sleep
+
+from papaya.cache import slot_cached_property
+
+
+class Counter:
+    __slots__ = ('calls', '_value', '_lock')
+
+    def __init__(self):
+        self.calls = 0
+        self._lock = RLock()
+
+    @slot_cached_property('_value', lock='_lock')
+    def value(self):
+        self.calls += 1
+        sleep(0.01)
+        return object()
+
+
+def test_computed_once_with_lock():
+    counter = Counter()
+    barrier = Barrier(8)
+
+    def get(_):
+        barrier.wait()
+        return counter.value
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        values = list(executor.map(get, range(8)))
+    assert counter.calls == 1
+    assert all(value is values[0] for value in values)
@@ -45,6 +45,7 @@ def metadata_queries():
         '$page_uris': '.pages__uris[]',
         '$date': '.date__str',
         '$license_uri': '.license',
+        '$description': '.description[]?',
         '$page_image_ids': '.images__ids[]',
         '$*page_doc': '.pages[]|select(.id == $uri)',
         '$*page_label': '.pages[]|select(.id == $uri).title',
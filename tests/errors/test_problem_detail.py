@@ -0,0 +1,50 @@
+import orjson
+import pytest
+from werkzeug.exceptions import NotFound
+
+from papaya.errors import (
+    ManifestNotFound,
+    ProblemDetailError,
+    ServiceProblem,
+    CanvasNotFound,
+    problem_detail_response,
+)
+
+
+@pytest.mark.parametrize(
+    'error',
+    [
+        ManifestNotFound(id='fcrepo:"123"'),
+        CanvasNotFound(canvas_name='7', manifest_id='fcrepo:123'),
+        ServiceProblem(),
+    ],
+)
+def test_as_problem_detail_json(error):
+    assert error.as_problem_detail_json() == orjson.dumps(error.as_problem_detail())
+
+
+def test_as_problem_detail_json_custom():
+    class CustomProblem(ProblemDetailError, NotFound):
+        name = 'Custom problem'
+        description = 'Custom problem with {thing}'
+
+        def as_problem_detail(self):
+            return {**super().as_problem_detail(), 'type': 'about:blank'}
+
+    assert orjson.loads(CustomProblem(thing='foo').as_problem_detail_json()) == {
+        'status': 404,
+        'title': 'Custom problem',
+        'details': 'Custom problem with foo',
+        'type': 'about:blank',
+    }
+
+
+def test_problem_detail_response():
+    response = problem_detail_response(ManifestNotFound(id='fcrepo:123'))
+    assert response.status_code == 404
+    assert response.content_type == 'application/problem+json'
+    assert orjson.loads(response.data) == {
+        'status': 404,
+        'title': 'Manifest not found',
+        'details': 'Manifest with identifier "fcrepo:123" not found',
+    }
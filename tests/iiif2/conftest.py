@@ -0,0 +1,32 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from papaya.iiif2 import ImageService, ImageInfo, PresentationContext
+from papaya.source import Resource, SolrService, RepositoryService
+
+
+@pytest.fixture
+def image_service():
+    service = MagicMock(spec=ImageService, thumbnail_width=250)
+    service.get_metadata.side_effect = lambda image_id: ImageInfo(
+        uri=f'http://example.com/iiif2/{image_id}',
+        context='http://iiif.io/api/image/2/context.json',
+        profile='http://iiif.io/api/image/2/level2.json',
+        width=1000,
+        height=1500,
+    )
+    return service
+
+
+@pytest.fixture
+def presentation_context(solr_doc, metadata_queries, image_service):
+    solr_service = MagicMock(spec=SolrService)
+    solr_service.get_resource.return_value = Resource(doc=solr_doc, metadata_queries=metadata_queries)
+    return PresentationContext(
+        solr_service=solr_service,
+        repo_service=RepositoryService(endpoint='http://example.com/fcrepo', prefix='fcrepo:'),
+        image_service=image_service,
+        endpoint_url='http://example.com/manifests',
+        logo_url='http://example.com/logo.png',
+    )
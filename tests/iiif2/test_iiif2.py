@@ -1,6 +1,10 @@
+from dataclasses import FrozenInstanceError
 from fractions import Fraction
+from unittest.mock import MagicMock
 
-from papaya.iiif2 import ImageParams, ImageInfo
+import pytest
+
+from papaya.iiif2 import ImageParams, ImageInfo, ImageService, ThumbnailImage
 
 
 def test_image_params_to_string():
@@ -14,6 +18,14 @@ def test_image_params_to_string():
     assert str(params) == '/full/100,100/90/default.png'
 
 
+def test_image_params_defaults():
+    params = ImageParams(size='100,')
+    assert str(params) == '/full/100,/0/default.jpg'
+    assert params == ImageParams('full', '100,')
+    with pytest.raises(FrozenInstanceError):
+        params.size = 'full'
+
+
 def test_image_info_aspect_ratio():
     info = ImageInfo(
         uri='http://example.com/foo',
@@ -23,3 +35,34 @@ def test_image_info_aspect_ratio():
         height=768,
     )
     assert info.aspect_ratio == Fraction(4, 3)
+
+
+def test_image_info_service():
+    info = ImageInfo(
+        uri='http://example.com/foo',
+        context='http://iiif.io/api/image/2/context.json',
+        profile='http://iiif.io/api/image/2/level2.json',
+        width=1024,
+        height=768,
+    )
+    assert info.service == {
+        '@context': 'http://iiif.io/api/image/2/context.json',
+        '@id': 'http://example.com/foo',
+        'profile': 'http://iiif.io/api/image/2/level2.json',
+    }
+    image = ThumbnailImage(MagicMock(spec=ImageService, thumbnail_width=250, get_metadata=lambda _: info), 'foo')
+    assert image.json()['service'] is info.service
+
+
+def test_thumbnail_image_size():
+    service = MagicMock(spec=ImageService, thumbnail_width=250)
+    service.get_metadata.return_value = ImageInfo(
+        uri='http://example.com/foo',
+        context='',
+        profile='',
+        width=1024,
+        height=768,
+    )
+    thumbnail = ThumbnailImage(service, 'foo')
+    assert thumbnail.height == int(thumbnail.width / service.get_metadata('foo').aspect_ratio) == 187
+    assert thumbnail.uri == 'http://example.com/foo/full/250,187/0/default.jpg'
@@ -7,7 +7,7 @@ from requests import Response
 from papaya.iiif2 import ImageService, ImageServiceError
 
 
-@patch('papaya.iiif2.requests.get')
+@patch('papaya.iiif2.requests.Session.get')
 def test_image_service_get_metadata(mock_get):
     mock_response = MagicMock(ok=True)
     mock_response.json.return_value = {
@@ -27,7 +27,7 @@ def test_image_service_get_metadata(mock_get):
     assert info.height == 768
 
 
-@patch('papaya.iiif2.requests.get')
+@patch('papaya.iiif2.requests.Session.get')
 def test_image_service_get_metadata_connection_error(mock_get):
     mock_get.side_effect = requests.ConnectionError()
     service = ImageService('http://example.com/iiif2')
@@ -35,9 +35,52 @@ def test_image_service_get_metadata_connection_error(mock_get):
         service.get_metadata('foo')
 
 
-@patch('papaya.iiif2.requests.get')
+@patch('papaya.iiif2.requests.Session.get')
+def test_image_service_get_metadata_timeout(mock_get):
+    mock_get.side_effect = requests.Timeout()
+    service = ImageService('http://example.com/iiif2', timeout=2)
+    with pytest.raises(ImageServiceError):
+        service.get_metadata('foo')
+    assert mock_get.call_args.kwargs['timeout'] == 2
+
+
+@patch('papaya.iiif2.requests.Session.get')
 def test_image_service_get_metadata_problem(mock_get):
     mock_get.return_value = MagicMock(spec=Response, ok=False, status_code=400)
     service = ImageService('http://example.com/iiif2')
     with pytest.raises(ImageServiceError):
         service.get_metadata('foo')
+
+
+@patch('papaya.iiif2.requests.Session.get')
+def test_image_service_get_metadata_cached(mock_get):
+    mock_response = MagicMock(ok=True)
+    mock_response.json.return_value = {
+        '@id': 'http://example.com/iiif2/foo',
+        '@context': 'iiif2',
+        'profile': {},
+        'width': 1024,
+        'height': 768,
+    }
+    mock_get.return_value = mock_response
+    service = ImageService('http://example.com/iiif2')
+    assert service.get_metadata('foo') == service.get_metadata('foo')
+    assert mock_get.call_count == 1
+    service.invalidate('foo')
+    service.get_metadata('foo')
+    assert mock_get.call_count == 2
+
+
+@patch('papaya.iiif2.requests.Session.get')
+def test_image_service_prefetch_metadata(mock_get):
+    def get(url, **kwargs):
+        response = MagicMock(ok=True)
+        response.json.return_value = {'@id': url, '@context': 'iiif2', 'profile': {}, 'width': 1024, 'height': 768}
+        return response
+
+    mock_get.side_effect = get
+    service = ImageService('http://example.com/iiif2', prefetch_workers=4)
+    service.prefetch_metadata(['foo', 'bar', 'baz', 'foo'])
+    assert mock_get.call_count == 3
+    assert service.get_metadata('bar').uri == 'http://example.com/iiif2/bar'
+    assert mock_get.call_count == 3
@@ -0,0 +1,80 @@
+import orjson
+import pytest
+
+from papaya.iiif2 import SearchHitsList
+from papaya.source import Resource, TaggedText
+
+
+def test_manifest_json(presentation_context):
+    manifest = presentation_context.get_manifest('fcrepo:123')
+    manifest_info = manifest.json(with_context=True)
+    assert manifest_info['@id'] == 'http://example.com/manifests/fcrepo:123/manifest'
+    assert manifest_info['label'] == 'Foobar'
+    assert manifest_info['logo'] == {'@id': 'http://example.com/logo.png'}
+    canvases = manifest_info['sequences'][0]['canvases']
+    assert [c['label'] for c in canvases] == ['Page 1', 'Page 2', 'Page 3']
+    assert manifest_info['thumbnail'] == canvases[0]['thumbnail']
+    assert canvases[0]['thumbnail']['width'] == 250
+    assert canvases[0]['thumbnail']['height'] == 375
+
+
+def test_manifest_iter_json(presentation_context):
+    manifest = presentation_context.get_manifest('fcrepo:123', 'foo')
+    assert orjson.loads(b''.join(manifest.iter_json(with_context=True))) == manifest.json(with_context=True)
+
+
+def test_search_hits_list_iter_json(presentation_context):
+    presentation_context.solr_service.get_text_matches.return_value = [
+        TaggedText.parse('foo|n=0&xywh=1,2,3,4'),
+        TaggedText.parse('foo|n=0&xywh=5,6,7,8'),
+    ]
+    canvas = presentation_context.get_manifest('fcrepo:123').find_canvas('0')
+    hits = SearchHitsList(canvas, 'foo')
+    hits_info = orjson.loads(b''.join(hits.iter_json(with_context=True)))
+    assert hits_info == orjson.loads(orjson.dumps(hits.json(with_context=True)))
+    assert [r['on']['selector']['value'] for r in hits_info['resources']] == ['xywh=1,2,3,4', 'xywh=5,6,7,8']
+
+
+def test_canvas_search_text_with_text_matches(presentation_context, solr_doc, metadata_queries):
+    presentation_context.solr_service.get_resource.return_value = Resource(
+        doc=solr_doc,
+        metadata_queries=metadata_queries,
+        text_matches=[
+            TaggedText.parse('foo|n=1&xywh=1,2,3,4'),
+            TaggedText.parse('foo|n=01&xywh=5,6,7,8'),
+            TaggedText.parse('foo|n=10&xywh=9,9,9,9'),
+        ],
+    )
+    manifest = presentation_context.get_manifest('fcrepo:123', 'foo', with_text_matches=True)
+    hits = manifest.find_canvas('1').search_text('foo')
+    assert [hit.params['xywh'] for hit in hits] == ['1,2,3,4', '5,6,7,8']
+    presentation_context.solr_service.get_text_matches.assert_not_called()
+
+
+def test_search_hits_list_iter_json_empty(presentation_context):
+    presentation_context.solr_service.get_text_matches.return_value = []
+    canvas = presentation_context.get_manifest('fcrepo:123').find_canvas('0')
+    assert orjson.loads(b''.join(SearchHitsList(canvas, 'foo').iter_json()))['resources'] == []
+
+
+def test_manifest_summary_json(presentation_context):
+    summary = presentation_context.get_manifest('fcrepo:123').summary_json()
+    assert 'sequences' not in summary
+    assert summary['thumbnail']['@id'] == 'http://example.com/iiif2/fcrepo:123:p1/full/250,375/0/default.jpg'
+
+
+def test_manifest_find(presentation_context):
+    manifest = presentation_context.get_manifest('fcrepo:123')
+    sequence = manifest.find_sequence('normal')
+    assert sequence is manifest.sequences[0]
+    assert manifest.find_canvas('1') is sequence.canvases[1]
+    with pytest.raises(KeyError):
+        manifest.find_sequence('missing')
+    with pytest.raises(KeyError):
+        manifest.find_canvas('missing')
+    assert manifest.has_sequence('normal')
+    assert not manifest.has_sequence('missing')
+    assert manifest.has_canvas('1')
+    assert not manifest.has_canvas('missing')
+    assert manifest.has_annotation(sequence.canvases[1].image_annotation.name)
+    assert not manifest.has_annotation('missing')
@@ -0,0 +1,68 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from papaya.cache import LRUCache
+from papaya.source import Resource
+
+
+def test_get_resource_uncached(presentation_context):
+    presentation_context.get_resource('fcrepo:123')
+    presentation_context.get_resource('fcrepo:123')
+    assert presentation_context.solr_service.get_resource.call_count == 2
+
+
+def test_get_resource_cached(presentation_context):
+    presentation_context.resource_cache = LRUCache(ttl=60)
+    resource = presentation_context.get_resource('fcrepo:123')
+    assert presentation_context.get_resource('fcrepo:123') is resource
+    presentation_context.get_resource('fcrepo:123', 'foo')
+    assert presentation_context.solr_service.get_resource.call_count == 2
+
+
+def test_get_manifest_cached(presentation_context):
+    presentation_context.manifest_cache = LRUCache(ttl=60)
+    manifest = presentation_context.get_manifest('fcrepo:123')
+    assert presentation_context.get_manifest('fcrepo:123') is manifest
+    assert presentation_context.get_manifest('fcrepo:123', 'foo') is not manifest
+    assert presentation_context.get_manifest('fcrepo:123', 'foo', with_text_matches=True) is not manifest
+
+
+def test_forget(presentation_context):
+    presentation_context.resource_cache = LRUCache(ttl=60)
+    presentation_context.manifest_cache = LRUCache(ttl=60)
+    presentation_context.get_resource('fcrepo:123')
+    presentation_context.get_resource('fcrepo:123', 'foo')
+    presentation_context.get_resource('fcrepo:456')
+    manifest = presentation_context.get_manifest('fcrepo:123')
+    presentation_context.forget('fcrepo:123')
+    assert presentation_context.get_manifest('fcrepo:123') is not manifest
+    presentation_context.get_resource('fcrepo:123')
+    presentation_context.get_resource('fcrepo:123', 'foo')
+    presentation_context.get_resource('fcrepo:456')
+    assert presentation_context.solr_service.get_resource.call_count == 5
+
+
+def test_get_manifest_cached_with_resource(presentation_context, solr_doc, metadata_queries):
+    now = 0.0
+    presentation_context.resource_cache = LRUCache(ttl=60, timer=lambda: now)
+    presentation_context.manifest_cache = LRUCache(ttl=60, timer=lambda: now)
+    manifest = presentation_context.get_manifest('fcrepo:123')
+    now = 30.0
+    assert presentation_context.get_manifest('fcrepo:123') is manifest
+    # the resource expires at 60 seconds, before the manifest would
+    updated = Resource(doc={**solr_doc, '_version_': 2}, metadata_queries=metadata_queries)
+    presentation_context.solr_service.get_resource.return_value = updated
+    now = 60.0
+    refreshed = presentation_context.get_manifest('fcrepo:123')
+    assert refreshed is not manifest
+    assert refreshed.resource is updated
+    assert refreshed.resource.version == 2
+
+
+def test_manifest_structure_built_once(presentation_context):
+    manifest = presentation_context.get_manifest('fcrepo:123')
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        indexes = list(executor.map(lambda _: manifest._annotation_by_name, range(8)))
+        sequences = list(executor.map(lambda _: manifest.sequences, range(8)))
+    assert all(index is indexes[0] for index in indexes)
+    assert all(s is sequences[0] for s in sequences)
+    assert indexes[0]['1-image'] is manifest.find_canvas('1').image_annotation
@@ -8,6 +8,17 @@ from papaya.source import format_value
     [
         ('untagged', 'untagged'),
         ('[@de]der Hund', {'@language': 'de', '@value': 'der Hund'}),
+        ('[@de der Hund', '[@de der Hund'),
+        ('[@ja-latn]inu', {'@language': 'ja-latn', '@value': 'inu'}),
+        ('[@en]line one\nline two', {'@language': 'en', '@value': 'line one\nline two'}),
+        ('[@en]', {'@language': 'en', '@value': ''}),
+        ('[@]no language', '[@]no language'),
+        ('[@en]]', {'@language': 'en', '@value': ']'}),
+        ('[@en][@de]Hund', {'@language': 'en', '@value': '[@de]Hund'}),
+        ('', ''),
+        ('x[@de]der Hund', 'x[@de]der Hund'),
+        (1992, 1992),
+        ({'@value': 'foo'}, {'@value': 'foo'}),
     ],
 )
 def test_format_value(value, expected):
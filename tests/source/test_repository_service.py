@@ -29,3 +29,38 @@ def test_get_iiif_id(repo_service):
 def test_get_iiif_id_wrong_endpoint(repo_service):
     with pytest.raises(URLError):
         repo_service.get_iiif_id('http://different.example.net/fcrepo/rest/foo/bar')
+
+
+@pytest.mark.parametrize(
+    'resource_uri',
+    [
+        'http://example.com/fcrepo/rest',
+        'http://example.com/fcrepo/restricted/foo',
+    ],
+)
+def test_get_iiif_id_not_below_endpoint(repo_service, resource_uri):
+    with pytest.raises(URLError):
+        repo_service.get_iiif_id(resource_uri)
+
+
+def test_get_iiif_id_endpoint_in_path(repo_service):
+    resource_uri = 'http://example.com/fcrepo/rest/foo/http://example.com/fcrepo/rest/bar'
+    assert repo_service.get_iiif_id(resource_uri) == 'fcrepo:foo:http:::example.com:fcrepo:rest:bar'
+
+
+@pytest.mark.parametrize(
+    'iiif_id',
+    [
+        'fcrepo:foo',
+        'fcrepo:foo:bar:baz',
+        'fcrepo:a1:b2:c3:d4:e5',
+    ],
+)
+def test_round_trip(repo_service, iiif_id):
+    assert repo_service.get_iiif_id(repo_service.get_resource_uri(iiif_id)) == iiif_id
+
+
+def test_custom_path_separator():
+    repo_service = RepositoryService(endpoint='http://example.com/fcrepo/rest', prefix='repo~', path_sep='~')
+    assert repo_service.get_resource_uri('repo~foo~bar') == 'http://example.com/fcrepo/rest/foo/bar'
+    assert repo_service.get_iiif_id('http://example.com/fcrepo/rest/foo/bar') == 'repo~foo~bar'
@@ -1,6 +1,6 @@
 import pytest
 
-from papaya.source import Resource
+from papaya.source import PageImageError, Resource
 
 
 @pytest.fixture
@@ -58,9 +58,75 @@ def test_get_page_index(resource):
     assert resource.index('http://example.com/fcrepo/123/p/3') == 2
 
 
+def test_get_page_index_duplicate_uri(solr_doc, metadata_queries):
+    page_uris = [*solr_doc['pages__uris'], 'http://example.com/fcrepo/123/p/1']
+    resource = Resource(doc={**solr_doc, 'pages__uris': page_uris}, metadata_queries=metadata_queries)
+    assert resource.index('http://example.com/fcrepo/123/p/1') == page_uris.index('http://example.com/fcrepo/123/p/1')
+
+
+def test_get_page_image_id_duplicate_uri(solr_doc, metadata_queries):
+    doc = {
+        **solr_doc,
+        'pages__uris': [*solr_doc['pages__uris'], 'http://example.com/fcrepo/123/p/1'],
+        'images__ids': [*solr_doc['images__ids'], 'fcrepo:123:p4'],
+    }
+    resource = Resource(doc=doc, metadata_queries=metadata_queries)
+    assert resource.get_page_image_id('http://example.com/fcrepo/123/p/1') == 'fcrepo:123:p1'
+
+
+def test_get_page_index_not_found(resource):
+    with pytest.raises(ValueError):
+        resource.index('http://example.com/fcrepo/123/p/4')
+
+
+def test_page_image_ids(resource):
+    assert resource.page_image_ids == ['fcrepo:123:p1', 'fcrepo:123:p2', 'fcrepo:123:p3']
+
+
 def test_get_page_image_id(resource):
     assert resource.get_page_image_id('http://example.com/fcrepo/123/p/3') == 'fcrepo:123:p3'
 
 
 def test_get_page_label(resource):
     assert resource.get_page_label('http://example.com/fcrepo/123/p/2') == 'Page 2'
+
+
+def test_version(solr_doc, metadata_queries):
+    assert Resource(doc=solr_doc, metadata_queries=metadata_queries).version is None
+    versioned_doc = {**solr_doc, '_version_': 1849543412345667584}
+    assert Resource(doc=versioned_doc, metadata_queries=metadata_queries).version == 1849543412345667584
+
+
+def test_compiled_queries_are_shared(solr_doc, metadata_queries):
+    first = Resource(doc=solr_doc, metadata_queries=metadata_queries)
+    second = Resource(doc=solr_doc, metadata_queries=metadata_queries)
+    assert first._jq_programs['$uri'] is second._jq_programs['$uri']
+
+
+def test_get_page_image_id_not_found(resource):
+    with pytest.raises(ValueError, match='is not a page of'):
+        resource.get_page_image_id('http://example.com/fcrepo/123/p/4')
+
+
+def test_get_page_image_id_mismatched_lists(solr_doc, metadata_queries, caplog):
+    doc = {**solr_doc, 'images__ids': solr_doc['images__ids'][:2]}
+    resource = Resource(doc=doc, metadata_queries=metadata_queries)
+    assert resource.get_page_image_id('http://example.com/fcrepo/123/p/1') == 'fcrepo:123:p1'
+    assert 'has 3 page URIs but 2 page image IDs' in caplog.text
+    with pytest.raises(PageImageError, match='has 3 page URIs but 2 page image IDs'):
+        resource.get_page_image_id('http://example.com/fcrepo/123/p/3')
+
+
+def test_get_page_labels(resource):
+    assert [resource.get_page_label(page_uri) for page_uri in resource.page_uris] == ['Page 1', 'Page 2', 'Page 3']
+
+
+def test_properties_are_computed_once(resource):
+    assert resource.uri is resource.uri
+    assert resource.metadata is resource.metadata
+    assert resource.page_uris is resource.page_uris
+
+
+def test_page_lookups_are_computed_once(resource):
+    page_doc = resource.get_page_doc('http://example.com/fcrepo/123/p/2')
+    assert resource.get_page_doc('http://example.com/fcrepo/123/p/2') is page_doc
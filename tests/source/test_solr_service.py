@@ -9,8 +9,7 @@ from papaya.source import SolrService, SolrLookupError, SolrDocumentNotFound, Re
 @pytest.fixture
 def mock_solr():
     def _mock_solr(result_docs):
-        mock_results = MagicMock(docs=result_docs)
-        mock_results.__len__.return_value = len(result_docs)
+        mock_results = MagicMock(docs=result_docs, hits=len(result_docs))
         mock_solr = MagicMock()
         mock_solr.search.return_value = mock_results
         return mock_solr
@@ -78,3 +77,119 @@ def test_get_resource(mock_solr_init, mock_solr, solr_doc, metadata_queries):
     resource = service.get_resource('http://example.com/fcrepo/123')
     assert isinstance(resource, Resource)
     assert resource.uri == 'http://example.com/fcrepo/123'
+
+
+@patch('pysolr.Solr')
+def test_solr_session(mock_solr_init, metadata_queries):
+    SolrService(
+        endpoint='http://example.com/foo',
+        metadata_queries=metadata_queries,
+        text_match_field='fulltext',
+        timeout=5,
+    )
+    _, kwargs = mock_solr_init.call_args
+    assert kwargs['timeout'] == 5
+    adapter = kwargs['session'].get_adapter('http://example.com/foo')
+    assert adapter.max_retries.total == 2
+
+
+@patch('pysolr.Solr')
+def test_get_resource_with_text_matches(mock_solr_init, solr_doc, metadata_queries):
+    def search(**kwargs):
+        tag = kwargs['hl.tag.pre']
+        results = MagicMock(
+            docs=[solr_doc],
+            hits=1,
+            highlighting={
+                'http://example.com/fcrepo/123': {
+                    'fulltext': [f'the {tag}foo|n=0&xywh=1,2,3,4{tag} and {tag}foo|n=2&xywh=5,6,7,8{tag}'],
+                },
+            },
+        )
+        return results
+
+    mock_solr_init.return_value.search.side_effect = search
+    service = SolrService(
+        endpoint='http://example.com/foo',
+        metadata_queries=metadata_queries,
+        text_match_field='fulltext',
+    )
+    resource = service.get_resource('http://example.com/fcrepo/123', 'foo')
+    assert mock_solr_init.return_value.search.call_count == 1
+    assert resource.doc == solr_doc
+    assert [(hit.text, hit.params['n']) for hit in resource.text_matches] == [('foo', '0'), ('foo', '2')]
+
+
+@patch('pysolr.Solr')
+def test_get_doc_field_list(mock_solr_init, mock_solr, solr_doc, metadata_queries):
+    mock_solr_init.return_value = mock_solr([solr_doc])
+    service = SolrService(
+        endpoint='http://example.com/foo',
+        metadata_queries=metadata_queries,
+        text_match_field='fulltext',
+        field_list=['id', 'title__txt'],
+    )
+    service.get_doc('http://example.com/fcrepo/123')
+    _, kwargs = mock_solr_init.return_value.search.call_args
+    assert kwargs['fl'] == 'id,title__txt,_version_'
+
+
+@pytest.mark.parametrize(
+    ('field_list', 'expected'),
+    [
+        ('id, title__txt', 'id,title__txt,_version_'),
+        ('id,_version_', 'id,_version_'),
+        (['_version_', 'id'], '_version_,id'),
+        (None, None),
+    ],
+)
+def test_field_list_includes_version(field_list, expected, metadata_queries):
+    service = SolrService(
+        endpoint='http://example.com/foo',
+        metadata_queries=metadata_queries,
+        text_match_field='fulltext',
+        field_list=field_list,
+    )
+    assert service.field_list == expected
+
+
+@patch('pysolr.Solr')
+def test_get_text_matches_on_page(mock_solr_init, metadata_queries):
+    def search(**kwargs):
+        tag = kwargs['hl.tag.pre']
+        results = MagicMock(
+            highlighting={
+                'http://example.com/fcrepo/123': {
+                    'fulltext': [
+                        f'{tag}foo|n=1&xywh=1,2,3,4{tag} {tag}foo|n=10&xywh=5,6,7,8{tag}',
+                        f'{tag}bar|n=1&xywh=9,9,9,9{tag} {tag}foo|n=2&xywh=0,0,1,1{tag}',
+                        f'{tag}baz|n=01&xywh=2,2,2,2{tag} {tag}baz|n=1%20&xywh=3,3,3,3{tag}',
+                    ],
+                },
+            },
+        )
+        return results
+
+    mock_solr_init.return_value.search.side_effect = search
+    service = SolrService(
+        endpoint='http://example.com/foo',
+        metadata_queries=metadata_queries,
+        text_match_field='fulltext',
+    )
+    hits = service.get_text_matches('http://example.com/fcrepo/123', 'foo', 1)
+    assert [(hit.text, hit.params['xywh']) for hit in hits] == [
+        ('foo', '1,2,3,4'),
+        ('bar', '9,9,9,9'),
+        ('baz', '2,2,2,2'),
+        ('baz', '3,3,3,3'),
+    ]
+    assert len(service.get_text_matches('http://example.com/fcrepo/123', 'foo')) == 6
+
+
+def test_invalid_metadata_query(metadata_queries):
+    with pytest.raises(ValueError):
+        SolrService(
+            endpoint='http://example.com/foo',
+            metadata_queries={**metadata_queries, 'Title': '.title__txt[[['},
+            text_match_field='fulltext',
+        )
@@ -1,3 +1,7 @@
+from urllib.parse import parse_qsl
+
+import pytest
+
 from papaya.source import TaggedText
 
 
@@ -5,3 +9,51 @@ def test_parse_tagged_text():
     tagged = TaggedText.parse('foobar|n=1&xywh=123,456,789,789')
     assert tagged.text == 'foobar'
     assert tagged.params == {'n': '1', 'xywh': '123,456,789,789'}
+
+
+def test_parse_tagged_text_extra_separator():
+    tagged = TaggedText.parse('foo|bar|n=1')
+    assert tagged.text == 'foo'
+    assert tagged.params == {'bar|n': '1'}
+
+
+def test_parse_tagged_text_no_separator():
+    with pytest.raises(ValueError):
+        TaggedText.parse('foobar')
+
+
+def test_parse_tagged_text_encoded_params():
+    tagged = TaggedText.parse('foobar|n=1&label=a%26b+c&blank=')
+    assert tagged.params == {'n': '1', 'label': 'a&b c'}
+
+
+@pytest.mark.parametrize(
+    'tag',
+    [
+        'n=1&xywh=123,456,789,789',
+        'n=1&&xywh=1,2,3,4',
+        'n=1&flag&xywh=1,2,3,4',
+        'n=1&n=2',
+        'n=a=b',
+        'n=1;xywh=1,2,3,4',
+        '',
+        'label=a%26b+c&blank=',
+    ],
+)
+def test_parse_tagged_text_matches_parse_qsl(tag):
+    assert TaggedText.parse(f'foobar|{tag}').params == dict(parse_qsl(tag))
+
+
+@pytest.mark.parametrize(
+    ('tag', 'page'),
+    [
+        ('n=1', 1),
+        ('n=01', 1),
+        ('n=1%20', 1),
+        ('n=10', 10),
+        ('n=x', None),
+        ('xywh=1,2,3,4', None),
+    ],
+)
+def test_tagged_text_page(tag, page):
+    assert TaggedText.parse(f'foobar|{tag}').page == page
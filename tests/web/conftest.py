@@ -0,0 +1,62 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from papaya.web import create_app
+
+
+@pytest.fixture
+def solr(solr_doc):
+    """Mock Solr client. Every search returns its `doc`, with a single text
+    match on the page with index 1 when highlighting is requested."""
+    solr = MagicMock()
+    solr.doc = {**solr_doc, '_version_': 1}
+
+    def search(**params):
+        tag = params.get('hl.tag.pre')
+        highlighting = {solr.doc['id']: {'fulltext': [f'a {tag}foo|n=1&xywh=1,2,3,4{tag} b']}} if tag else {}
+        return MagicMock(docs=[solr.doc], hits=1, highlighting=highlighting)
+
+    solr.search.side_effect = search
+    return solr
+
+
+@pytest.fixture
+def image_get():
+    """Mock for `requests.Session.get` that returns IIIF Image API image information."""
+
+    def get(url, **kwargs):
+        response = MagicMock(ok=True, status_code=200)
+        response.json.return_value = {
+            '@id': url,
+            '@context': 'http://iiif.io/api/image/2/context.json',
+            'profile': 'http://iiif.io/api/image/2/level2.json',
+            'width': 1000,
+            'height': 1500,
+        }
+        return response
+
+    return MagicMock(side_effect=get)
+
+
+@pytest.fixture
+def app(monkeypatch, solr, image_get, metadata_queries):
+    config = {
+        'URL': 'http://localhost/manifests',
+        'FCREPO_ENDPOINT': 'http://example.com/fcrepo',
+        'FCREPO_PREFIX': 'fcrepo:',
+        'SOLR_ENDPOINT': 'http://example.com/solr',
+        'SOLR_TEXT_MATCH_FIELD': 'fulltext',
+        'IIIF_IMAGE_ENDPOINT': 'http://example.com/iiif2',
+        'METADATA_QUERIES': json.dumps(metadata_queries),
+    }
+    for key, value in config.items():
+        monkeypatch.setenv(f'PAPAYA_{key}', value)
+    with patch('pysolr.Solr', return_value=solr), patch('requests.Session.get', image_get):
+        yield create_app()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
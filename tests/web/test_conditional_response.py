@@ -0,0 +1,70 @@
+from unittest.mock import patch
+
+import pytest
+
+from papaya.web import create_app
+
+COMPONENT_PATHS = [
+    '/manifests/fcrepo:123/manifest',
+    '/manifests/fcrepo:123/manifest?q=foo',
+    '/manifests/fcrepo:123/summary',
+    '/manifests/fcrepo:123/sequence/normal',
+    '/manifests/fcrepo:123/canvas/0',
+    '/manifests/fcrepo:123/annotation/0-image',
+    '/manifests/fcrepo:123/list/1-search?q=foo',
+]
+
+
+@pytest.mark.parametrize('path', COMPONENT_PATHS)
+def test_not_modified(client, path):
+    response = client.get(path)
+    assert response.status_code == 200
+    etag = response.headers['ETag']
+    response = client.get(path, headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+    assert response.headers['ETag'] == etag
+
+
+@pytest.mark.parametrize('path', COMPONENT_PATHS)
+def test_not_modified_weak_validator(client, path):
+    etag = client.get(path).headers['ETag']
+    response = client.get(path, headers={'If-None-Match': f'W/{etag}'})
+    assert response.status_code == 304
+    assert response.data == b''
+    assert response.headers['ETag'] == etag
+
+
+@pytest.mark.parametrize('path', COMPONENT_PATHS)
+def test_etag_mismatch(client, path):
+    response = client.get(path, headers={'If-None-Match': '"other"'})
+    assert response.status_code == 200
+    assert response.json['@id']
+    assert 'ETag' in response.headers
+
+
+@pytest.mark.parametrize('path', COMPONENT_PATHS)
+def test_no_etag_without_version(client, solr, path):
+    del solr.doc['_version_']
+    response = client.get(path)
+    assert response.status_code == 200
+    assert response.json['@id']
+    assert 'ETag' not in response.headers
+
+
+@pytest.mark.parametrize('path', ['/manifests/fcrepo:123/manifest', '/manifests/fcrepo:123/canvas/0'])
+def test_etag_depends_on_config(client, monkeypatch, path):
+    etag = client.get(path).headers['ETag']
+    # the same configuration gives the same ETag, e.g., after a restart
+    assert create_app().test_client().get(path).headers['ETag'] == etag
+    monkeypatch.setenv('PAPAYA_LOGO_URL', 'http://example.com/other-logo.png')
+    response = create_app().test_client().get(path, headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+
+def test_etag_depends_on_version(client):
+    path = '/manifests/fcrepo:123/manifest'
+    etag = client.get(path).headers['ETag']
+    with patch('papaya.web.__version__', '0.0.0-other'):
+        assert create_app().test_client().get(path).headers['ETag'] != etag
@@ -0,0 +1,42 @@
+from urllib.parse import quote
+
+import pytest
+from flask import url_for
+
+MANIFEST_IDS = ['fcrepo:123', 'fcrepo:a b', 'fcrepo:100%', 'fcrepo:a?b', 'fcrepo:a#b']
+
+
+def expected_url(app, manifest_id, external, script_name='', **query):
+    with app.test_request_context('/', environ_base={'SCRIPT_NAME': script_name}):
+        return url_for('get_manifest', manifest_id=manifest_id, _external=external, **query)
+
+
+@pytest.mark.parametrize('manifest_id', MANIFEST_IDS)
+@pytest.mark.parametrize('script_name', ['', '/iiif'])
+def test_redirect_to_manifest(app, client, manifest_id, script_name):
+    response = client.get(f'/manifests/{quote(manifest_id, safe=":")}/', environ_base={'SCRIPT_NAME': script_name})
+    assert response.status_code == 301
+    assert response.headers['Location'] == expected_url(app, manifest_id, False, script_name)
+
+
+@pytest.mark.parametrize('manifest_id', MANIFEST_IDS)
+@pytest.mark.parametrize('script_name', ['', '/iiif'])
+def test_find_manifest(app, client, manifest_id, script_name):
+    uri = 'http://example.com/fcrepo/' + manifest_id.removeprefix('fcrepo:')
+    response = client.post(
+        '/manifests/', data={'uri': uri, 'text_query': 'foo bar'}, environ_base={'SCRIPT_NAME': script_name}
+    )
+    assert response.status_code == 302
+    assert response.headers['Location'] == expected_url(app, manifest_id, True, script_name, q='foo bar')
+
+
+def test_find_manifest_without_text_query(app, client):
+    response = client.post('/manifests/', data={'uri': 'http://example.com/fcrepo/123'})
+    assert response.headers['Location'] == 'http://localhost/manifests/fcrepo:123/manifest'
+
+
+def test_redirect_with_server_name(app, client):
+    app.config['SERVER_NAME'] = 'iiif.example.com'
+    response = client.get('/manifests/fcrepo:123/', base_url='http://iiif.example.com')
+    with app.test_request_context('/', base_url='http://iiif.example.com'):
+        assert response.headers['Location'] == url_for('get_manifest', manifest_id='fcrepo:123')
@@ -0,0 +1,34 @@
+import orjson
+import pytest
+
+
+@pytest.mark.parametrize(
+    ('path', 'title', 'details'),
+    [
+        (
+            '/manifests/fcrepo:123/sequence/missing',
+            'Sequence not found',
+            'Sequence with name "missing" not found in manifest "fcrepo:123"',
+        ),
+        (
+            '/manifests/fcrepo:123/canvas/99',
+            'Canvas not found',
+            'Canvas with name "99" not found in manifest "fcrepo:123"',
+        ),
+        (
+            '/manifests/fcrepo:123/annotation/99-image',
+            'Annotation not found',
+            'Annotation with name "99-image" not found in manifest "fcrepo:123"',
+        ),
+        (
+            '/manifests/fcrepo:123/list/99-search?q=foo',
+            'Canvas not found',
+            'Canvas with name "99" not found in manifest "fcrepo:123"',
+        ),
+    ],
+)
+def test_component_not_found(client, path, title, details):
+    response = client.get(path)
+    assert response.status_code == 404
+    assert response.content_type == 'application/problem+json'
+    assert orjson.loads(response.data) == {'status': 404, 'title': title, 'details': details}
@@ -0,0 +1,27 @@
+from flask import Flask
+
+from papaya.web import OrjsonProvider
+
+
+def test_orjson_provider_response():
+    app = Flask(__name__)
+    app.json = OrjsonProvider(app)
+    with app.app_context():
+        response = app.json.response({'@id': 'http://example.com/foo', 'width': 1024})
+    assert response.mimetype == 'application/json'
+    assert response.get_json() == {'@id': 'http://example.com/foo', 'width': 1024}
+
+
+def test_orjson_provider_non_str_keys():
+    app = Flask(__name__)
+    app.json = OrjsonProvider(app)
+    assert app.json.loads(app.json.dumps({1: 'one'})) == {'1': 'one'}
+
+
+def test_orjson_provider_view_response():
+    app = Flask(__name__)
+    app.json = OrjsonProvider(app)
+    app.add_url_rule('/', 'index', lambda: {'@id': 'http://example.com/foo', 'sizes': [1, 2]})
+    response = app.test_client().get('/')
+    assert response.mimetype == 'application/json'
+    assert response.data == b'{"@id":"http://example.com/foo","sizes":[1,2]}'
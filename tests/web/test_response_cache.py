@@ -0,0 +1,80 @@
+from unittest.mock import patch
+
+import pytest
+
+from papaya.iiif2 import Canvas, ImageAnnotation, Manifest, Sequence
+
+
+@pytest.fixture
+def build_counts():
+    """Counts the calls to the methods that build the JSON for the manifest components."""
+    with (
+        patch.object(Sequence, 'json', autospec=True, side_effect=Sequence.json) as sequence_json,
+        patch.object(Canvas, 'json', autospec=True, side_effect=Canvas.json) as canvas_json,
+        patch.object(Manifest, 'summary_json', autospec=True, side_effect=Manifest.summary_json) as summary_json,
+        patch.object(Manifest, 'iter_json', autospec=True, side_effect=Manifest.iter_json) as manifest_json,
+    ):
+        yield lambda: sum(m.call_count for m in (sequence_json, canvas_json, summary_json, manifest_json))
+
+
+@pytest.fixture
+def uncached_client(monkeypatch, request):
+    """Client for an app that retrieves the resource from Solr for every request."""
+    monkeypatch.setenv('PAPAYA_RESOURCE_CACHE_TTL', '0')
+    return request.getfixturevalue('app').test_client()
+
+
+PATHS = [
+    '/manifests/fcrepo:123/manifest',
+    '/manifests/fcrepo:123/summary',
+    '/manifests/fcrepo:123/sequence/normal',
+    '/manifests/fcrepo:123/canvas/0',
+]
+
+
+@pytest.mark.parametrize('path', PATHS)
+def test_serves_cached_bytes(client, build_counts, path):
+    first = client.get(path)
+    # read the whole body, since the manifest is streamed
+    body = first.data
+    builds = build_counts()
+    assert builds > 0
+    second = client.get(path)
+    assert second.data == body
+    assert second.headers['ETag'] == first.headers['ETag']
+    assert build_counts() == builds
+
+
+@pytest.mark.parametrize('path', PATHS)
+def test_recache(client, solr, build_counts, path):
+    first = client.get(path)
+    body = first.data
+    searches = solr.search.call_count
+    builds = build_counts()
+    response = client.get(path + '?recache=1')
+    assert response.data == body
+    assert solr.search.call_count == searches + 1
+    assert build_counts() > builds
+
+
+def test_new_version(uncached_client, solr):
+    path = '/manifests/fcrepo:123/summary'
+    first = uncached_client.get(path)
+    assert first.json['label'] == 'Foobar'
+    # without a new version, the cached bytes are still used
+    solr.doc['title__txt'] = 'New Title'
+    assert uncached_client.get(path).data == first.data
+    solr.doc['_version_'] = 2
+    response = uncached_client.get(path)
+    assert response.json['label'] == 'New Title'
+    assert response.headers['ETag'] != first.headers['ETag']
+
+
+def test_annotation_cached_once_for_all_text_queries(client):
+    path = '/manifests/fcrepo:123/annotation/0-image'
+    with patch.object(ImageAnnotation, 'json', autospec=True, side_effect=ImageAnnotation.json) as annotation_json:
+        first = client.get(path)
+        second = client.get(path + '?q=foo')
+    assert annotation_json.call_count == 1
+    assert second.data == first.data
+    assert second.headers['ETag'] == first.headers['ETag']
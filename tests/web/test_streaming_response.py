@@ -0,0 +1,30 @@
+from unittest.mock import patch
+
+import pytest
+
+from papaya.iiif2 import Canvas, Manifest
+from papaya.source import PageImageError
+
+MANIFEST_PATH = '/manifests/fcrepo:123/manifest'
+
+
+def test_error_after_first_chunk(client, caplog):
+    canvas_json = Canvas.json
+
+    def fail_on_last_canvas(canvas, *args, **kwargs):
+        if canvas.name == '2':
+            raise PageImageError('no image')
+        return canvas_json(canvas, *args, **kwargs)
+
+    with patch.object(Canvas, 'json', autospec=True, side_effect=fail_on_last_canvas):
+        response = client.get(MANIFEST_PATH)
+        assert response.status_code == 200
+        with pytest.raises(PageImageError):
+            _ = response.data
+    assert f'Error while streaming the response for {MANIFEST_PATH}' in caplog.text
+
+    # the partial body was not cached, so the manifest is built again
+    with patch.object(Manifest, 'iter_json', autospec=True, side_effect=Manifest.iter_json) as iter_json:
+        response = client.get(MANIFEST_PATH)
+        assert response.json['sequences'][0]['canvases'][2]['label'] == 'Page 3'
+    assert iter_json.call_count == 1